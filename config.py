@@ -26,6 +26,9 @@ REPO_ROOT: Path = Path(__file__).resolve().parent
 class ServerSettings(BaseSettings):
     host: str = "127.0.0.1"
     port: int = 8000
+    # Browsers reuse the connection for the burst of API calls after page load.
+    timeout_keep_alive: int = Field(default=75, ge=1)
+    backlog: int = Field(default=2048, ge=1)
     base_url: str = "https://learning.oreilly.com"
     app_version: str = "2.0.0"
     astro_fallback_node_version: str = "22.20.0"
@@ -55,6 +58,12 @@ class HttpSettings(BaseSettings):
     max_redirects: int = 5
     max_response_size_mb: int = 50
     max_assets_per_book: int = 2_000
+    # Connection pooling for the shared upstream client. Chapters and assets
+    # are many small requests against the same hosts, so keep-alive matters
+    # more than raw concurrency. HTTP/2 is used only when ``h2`` is installed.
+    http2: bool = True
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
     user_agent: str | None = None
     enable_fake_useragent: bool = False
     accept: str = "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
@@ -81,6 +90,10 @@ class SecuritySettings(BaseSettings):
     cors_origins: list[str] = Field(
         default_factory=lambda: ["http://localhost:8000", "http://127.0.0.1:8000"]
     )
+    cors_max_age: int = 86_400
+    cors_allow_headers: list[str] = Field(
+        default_factory=lambda: ["Content-Type", "Authorization", "X-Request-ID"]
+    )
 
 
 class RateLimitSettings(BaseSettings):
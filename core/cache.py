@@ -306,7 +306,7 @@ def cached(
         key_parts: list[str] = [func_name]
         key_parts.extend(str(arg) for arg in args)
         key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-        return hashlib.sha256(_key_delim.join(key_parts).encode()).hexdigest()[:32]
+        return hashlib.blake2b(_key_delim.join(key_parts).encode(), digest_size=16).hexdigest()
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         if not asyncio.iscoroutinefunction(func):
@@ -349,7 +349,7 @@ def make_cache_key(*args: Any, **kwargs: Any) -> str:
     key_parts: list[str] = []
     key_parts.extend(str(arg) for arg in args)
     key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-    return hashlib.sha256(_key_delim.join(key_parts).encode()).hexdigest()[:32]
+    return hashlib.blake2b(_key_delim.join(key_parts).encode(), digest_size=16).hexdigest()
 
 
 # Global cache instances
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import importlib.util
 import json
 import logging
 import re
@@ -79,13 +80,30 @@ class HttpClient:
         base = config.BASE_URL.rstrip("/") + "/"
         return urljoin(base, url.lstrip("/"))
 
+    @staticmethod
+    def _http2_enabled() -> bool:
+        """Return ``True`` when HTTP/2 is requested and ``h2`` is importable.
+
+        httpx raises at client construction if ``http2=True`` without the
+        optional ``h2`` package, so fall back to pooled HTTP/1.1 instead.
+        """
+        if not config.SETTINGS.http.http2:
+            return False
+        return importlib.util.find_spec("h2") is not None
+
     # ---- lifecycle -------------------------------------------------------
 
     async def __aenter__(self) -> HttpClient:
         if self._client is None:
+            http_settings = config.SETTINGS.http
             self._client = httpx.AsyncClient(
                 headers=dict(config.HEADERS),
                 timeout=config.REQUEST_TIMEOUT,
+                http2=self._http2_enabled(),
+                limits=httpx.Limits(
+                    max_connections=max(1, int(http_settings.max_connections)),
+                    max_keepalive_connections=max(0, int(http_settings.max_keepalive_connections)),
+                ),
             )
             self._owns_client = True
         self._load_cookies(self._cookies_file)
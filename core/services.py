@@ -254,8 +254,10 @@ class DownloadQueueService:
                 return self._progress_version
             self._async_waiters.add(waiter)
         try:
+            # asyncio.timeout cancels in place; wait_for would wrap the wait in a task.
             with contextlib.suppress(TimeoutError):
-                await asyncio.wait_for(event.wait(), timeout=max(0.0, timeout_seconds))
+                async with asyncio.timeout(max(0.0, timeout_seconds)):
+                    await event.wait()
         finally:
             with self._progress_condition:
                 self._async_waiters.discard(waiter)
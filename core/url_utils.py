@@ -4,20 +4,31 @@ from __future__ import annotations
 
 import ipaddress
 import logging
+import re
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse
 
 import config
 
 logger = logging.getLogger(__name__)
 
+# Whitespace or URL delimiters can never appear in a plain hostname.
+_UNSAFE_HOST_CHARS_RE = re.compile(r"[\s\[\]:/\\@?&#%]")
 
-def _configured_base_host() -> str:
+
+@lru_cache(maxsize=8)
+def _base_host_of(base_url: str) -> str:
     try:
-        return (urlparse(config.BASE_URL).hostname or "").lower()
+        return (urlparse(base_url).hostname or "").lower()
     except ValueError:
         return ""
 
 
+def _configured_base_host() -> str:
+    # Keyed on the current value, so a reloaded BASE_URL is picked up.
+    return _base_host_of(config.BASE_URL)
+
+
 def _is_allowed_host(host: str) -> bool:
     base_host = _configured_base_host()
     return bool(base_host) and (host == base_host or host.endswith(f".{base_host}"))
@@ -26,14 +37,10 @@ def _is_allowed_host(host: str) -> bool:
 def _is_blocked_host(host: str) -> bool:
     if not host:
         return True
-    if any(ch.isspace() for ch in host):
-        return True
-    if any(ch in "[]:/\\@?&#%" for ch in host):
+    if _UNSAFE_HOST_CHARS_RE.search(host):
         return True
     if host == "localhost" or host.endswith(".local"):
         return True
-    if "%" in host:
-        return True
 
     # Detect hex/octal IP encodings
     try:
@@ -69,6 +76,9 @@ def _normalize_candidate_url(raw_url: str, *, base_url: str = "") -> str:
 
 def is_safe_url(url: str) -> bool:
     """Check if URL is allowed for remote fetches."""
+    if ":" not in url:
+        # No scheme at all (a relative reference): never an http(s) URL.
+        return False
     try:
         parsed = urlparse(url)
     except ValueError:
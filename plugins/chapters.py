@@ -36,14 +36,15 @@ class ChaptersPlugin(Plugin):
             seen_urls.add(url)
             data = await self.http.get_json(url)
             for ch in data.get("results", []):
+                related_assets = ch.get("related_assets") or {}
                 chapters.append(
                     ChapterInfo(
                         ourn=ch.get("ourn", ""),
                         title=ch.get("title", ""),
                         filename=self._extract_filename(ch.get("reference_id", "")),
                         content_url=ch.get("content_url", ""),
-                        images=(ch.get("related_assets") or {}).get("images", []),
-                        stylesheets=(ch.get("related_assets") or {}).get("stylesheets", []),
+                        images=related_assets.get("images", []),
+                        stylesheets=related_assets.get("stylesheets", []),
                         virtual_pages=ch.get("virtual_pages"),
                         minutes_required=ch.get("minutes_required"),
                     )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 import shutil
 import time
@@ -20,6 +21,9 @@ _ALLOWED_DOWNLOAD_HOSTS: tuple[str, ...] = (
     "oreil.ly",
 )
 
+# Number of recent chapter durations averaged for the ETA estimate.
+_ETA_WINDOW_SIZE = 5
+
 
 @dataclass
 class DownloadProgress:
@@ -137,6 +141,7 @@ class PdfPluginProtocol(Protocol):
         chapters: list[ChapterInfo],
         output_dir: Path,
         css_files: list[str],
+        cancel_check: Callable[[], bool] | None = None,
     ) -> list[Path]: ...
 
 
@@ -383,61 +388,90 @@ class DownloaderPlugin(Plugin):
         # Phase 4: Process chapters
         all_css_urls: set[str] = set()
         all_image_urls: set[str] = set()
-        chapters_data: list[tuple[str, str, str]] = []
+        # Only the count is reported; processed bodies are on disk already.
+        chapters_written = 0
         total_chapters = len(chapters)
-        chapter_times: list[float] = []
+        # Rolling window of the last few chapter durations; the running sum
+        # avoids re-summing the window on every chapter.
+        eta_window: list[float] = []
+        eta_window_sum = 0.0
         chapter_start_time = time.time()
 
-        for i, ch in enumerate(chapters):
-            if check_cancel():
-                self._cleanup_on_cancel(book_dir)
-                raise Exception("Download cancelled by user")
+        next_content: asyncio.Task[str] | None = None
+        try:
+            for i, ch in enumerate(chapters):
+                if check_cancel():
+                    self._cleanup_on_cancel(book_dir)
+                    raise Exception("Download cancelled by user")
 
-            chapter_pct = 15 + int((i / total_chapters) * 65) if total_chapters > 0 else 15
+                chapter_pct = 15 + int((i / total_chapters) * 65) if total_chapters > 0 else 15
 
-            report(
-                "processing_chapters",
-                chapter_pct,
-                current_chapter=i + 1,
-                total_chapters=total_chapters,
-                chapter_title=ch.get("title", ""),
-            )
+                report(
+                    "processing_chapters",
+                    chapter_pct,
+                    current_chapter=i + 1,
+                    total_chapters=total_chapters,
+                    chapter_title=ch.get("title", ""),
+                )
 
-            filename = ch["filename"].replace(".html", ".xhtml")
-            file_path = (oebps / filename).resolve()
-            try:
-                file_path.relative_to(oebps.resolve())
-            except ValueError as exc:
-                raise ValueError(f"Chapter filename escapes output directory: {filename}") from exc
-            depth = filename.count("/")
-            path_prefix = "../" * depth if depth > 0 else ""
-
-            raw_html = await chapters_plugin.fetch_content(ch["content_url"])
-            processed, images = html_processor.process(
-                raw_html, book_id, skip_images=skip_images, path_prefix=path_prefix
-            )
+                filename = ch["filename"].replace(".html", ".xhtml")
+                file_path = (oebps / filename).resolve()
+                try:
+                    file_path.relative_to(oebps.resolve())
+                except ValueError as exc:
+                    raise ValueError(
+                        f"Chapter filename escapes output directory: {filename}"
+                    ) from exc
+                depth = filename.count("/")
+                path_prefix = "../" * depth if depth > 0 else ""
+
+                if next_content is None:
+                    raw_html = await chapters_plugin.fetch_content(ch["content_url"])
+                else:
+                    raw_html = await next_content
+                # Fetch the next chapter while this one is parsed off the loop.
+                next_content = (
+                    asyncio.create_task(
+                        chapters_plugin.fetch_content(chapters[i + 1]["content_url"])
+                    )
+                    if i + 1 < total_chapters
+                    else None
+                )
+                processed, images = await asyncio.to_thread(
+                    html_processor.process,
+                    raw_html,
+                    book_id,
+                    skip_images=skip_images,
+                    path_prefix=path_prefix,
+                )
 
-            all_css_urls.update(ch["stylesheets"])
-            for img_url in ch["images"]:
-                all_image_urls.add(img_url)
-            for img_url in images:
-                if img_url.startswith("http") or img_url.startswith("/"):
+                all_css_urls.update(ch["stylesheets"])
+                for img_url in ch["images"]:
                     all_image_urls.add(img_url)
+                for img_url in images:
+                    if img_url.startswith("http") or img_url.startswith("/"):
+                        all_image_urls.add(img_url)
+
+                css_refs = [
+                    f"{path_prefix}Styles/Style{j:02d}.css" for j in range(len(all_css_urls))
+                ]
+                xhtml = html_processor.wrap_xhtml(processed, css_refs, ch["title"])
 
-            css_refs = [f"{path_prefix}Styles/Style{j:02d}.css" for j in range(len(all_css_urls))]
-            xhtml = html_processor.wrap_xhtml(processed, css_refs, ch["title"])
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text(xhtml, encoding="utf-8")
 
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(xhtml, encoding="utf-8")
+                chapters_written += 1
 
-            chapters_data.append((ch["filename"], ch["title"], processed))
+                now = time.time()
+                chapter_time = now - chapter_start_time
+                chapter_start_time = now
 
-            chapter_time = time.time() - chapter_start_time
-            chapter_times.append(chapter_time)
-            chapter_start_time = time.time()
+                if len(eta_window) == _ETA_WINDOW_SIZE:
+                    eta_window_sum -= eta_window.pop(0)
+                eta_window.append(chapter_time)
+                eta_window_sum += chapter_time
 
-            if chapter_times:
-                avg_time = sum(chapter_times[-5:]) / len(chapter_times[-5:])
+                avg_time = eta_window_sum / len(eta_window)
                 remaining = total_chapters - (i + 1)
                 eta_seconds = int(avg_time * remaining)
                 report(
@@ -448,6 +482,12 @@ class DownloaderPlugin(Plugin):
                     total_chapters=total_chapters,
                     chapter_title=ch.get("title", ""),
                 )
+        finally:
+            if next_content is not None:
+                next_content.cancel()
+                # Collect only the prefetch's own outcome; a cancellation aimed
+                # at this task while it waits still propagates.
+                await asyncio.gather(next_content, return_exceptions=True)
 
         # Phase 5: Download assets
         report("downloading_assets", 80, eta_seconds=None)
@@ -506,7 +546,7 @@ class DownloaderPlugin(Plugin):
             book_id=book_id,
             title=book_info.get("title", ""),
             output_dir=book_dir,
-            chapters_count=len(chapters_data),
+            chapters_count=chapters_written,
         )
 
         if "epub" in formats:
@@ -535,8 +575,12 @@ class DownloaderPlugin(Plugin):
                         chapters=chapters,
                         output_dir=book_dir,
                         css_files=css_list,
+                        cancel_check=check_cancel,
                     )
                 )
+                if check_cancel():
+                    self._cleanup_on_cancel(book_dir)
+                    raise Exception("Download cancelled by user")
                 result.files["pdf"] = [str(p) for p in pdf_paths]
             else:
                 report("generating_pdf", 95)
@@ -1,22 +1,97 @@
+import html as html_module
 import logging
 import re
 import shutil
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlsplit, urlunsplit
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 
-from bs4 import BeautifulSoup, CData
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 
 from .base import Plugin
 
 logger = logging.getLogger(__name__)
 
+_VOID_TAGS = (
+    "br",
+    "img",
+    "input",
+    "meta",
+    "link",
+    "hr",
+    "source",
+    "track",
+    "wbr",
+    "area",
+    "base",
+    "col",
+    "embed",
+    "param",
+)
+
+_CONTENT_DIV_XPATH = etree.XPath('//div[@id="sbo-rt-content"]')
+_CONTENT_DIV_START_RE = re.compile(
+    r"""<div\b[^>]*?\sid\s*=\s*["']?sbo-rt-content\b""", re.IGNORECASE
+)
+# Markup whose body is not parsed as tags; a content-div match inside one of
+# these is not the real content div.
+_OPAQUE_SECTIONS = (("<!--", "-->"), ("<script", "</script"), ("<style", "</style"))
+
+
+def _mentions_cover(attr: str) -> str:
+    """XPath test: ``attr`` contains "cover" in any ASCII case."""
+    return f"contains(translate({attr}, 'COVER', 'cover'), 'cover')"
+
+
+# First <img> that looks like a cover, else the first <img> inside a
+# cover-looking <div>; evaluated in that order by detect_cover_image.
+_COVER_IMG_XPATH = etree.XPath(
+    "(descendant-or-self::img["
+    + " or ".join(_mentions_cover(attr) for attr in ("@src", "@alt", "@id", "@class"))
+    + "])[1]"
+)
+_COVER_DIV_IMG_XPATH = etree.XPath(
+    "(descendant-or-self::div["
+    + " or ".join(_mentions_cover(attr) for attr in ("@id", "@class"))
+    + "]//img)[1]"
+)
+
+_BARE_AMPERSAND_RE = re.compile(r"&(?!#[0-9]+;|#x[0-9a-fA-F]+;|[a-zA-Z][a-zA-Z0-9]*;)")
+
+# A void start tag (with or without attributes) that is neither self-closed
+# nor followed by an explicit end tag.
+_OPEN_VOID_TAG_RE = re.compile(
+    rf"<({'|'.join(_VOID_TAGS)})\b(?:([^>]*[^/]))?>(?!</\1>)",
+    flags=re.IGNORECASE,
+)
+
+
+def _close_void_tag(match: re.Match[str]) -> str:
+    tag = match.group(1)
+    # lxml already lowercases tag names; only mixed-case input pays for lower().
+    if not tag.islower():
+        tag = tag.lower()
+    return f"<{tag}{match.group(2) or ''} />"
+
+
+_UNSAFE_STEM_CHARS_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+_CSS_CONTENT_URL_RE = re.compile(r"content\s*:\s*url\([^)]+\)")
+_CSS_CONTENT_URL_RULE_RE = re.compile(
+    r'([^{}]+?)\s*\{[^}]*?content\s*:\s*url\(["\']?([^)"\']+)["\']?\)[^}]*\}'
+)
+_CSS_PSEUDO_ELEMENT_RE = re.compile(r"::?(before|after)")
+
 
 class HtmlProcessorPlugin(Plugin):
     @staticmethod
     def _escape_ampersands(text: str) -> str:
         """Escape bare & that are not part of a valid HTML entity."""
-        return re.sub(r"&(?!#[0-9]+;|#x[0-9a-fA-F]+;|[a-zA-Z][a-zA-Z0-9]*;)", "&amp;", text)
+        return _BARE_AMPERSAND_RE.sub("&amp;", text)
 
     @staticmethod
     def _to_xhtml(html_str: str) -> str:
@@ -25,103 +100,189 @@ class HtmlProcessorPlugin(Plugin):
         Skips tags that are already self-closing (/>) to avoid producing
         invalid markup like '<img ... / />'.
         """
-        void_tags = (
-            "br",
-            "img",
-            "input",
-            "meta",
-            "link",
-            "hr",
-            "source",
-            "track",
-            "wbr",
-            "area",
-            "base",
-            "col",
-            "embed",
-            "param",
-        )
-        for tag in void_tags:
-            # Match <tag ...> only when it does NOT already end with />
-            html_str = re.sub(
-                rf"<{tag}\b([^>]*[^/])>(?!</{tag}>)",
-                rf"<{tag}\1 />",
-                html_str,
-                flags=re.IGNORECASE,
-            )
-            # Also catch <tag> with no attributes (bare open tag)
-            html_str = re.sub(
-                rf"<{tag}\b>(?!</{tag}>)",
-                rf"<{tag} />",
-                html_str,
-                flags=re.IGNORECASE,
-            )
-        return html_str
+        return _OPEN_VOID_TAG_RE.sub(_close_void_tag, html_str)
 
     def process(
         self, html: str, book_id: str, skip_images: bool = False, path_prefix: str = ""
     ) -> tuple[str, list[str]]:
-        soup = BeautifulSoup(html, "lxml")
-        images_found: list[str] = []
+        root = self._parse_document(self._content_fragment(html))
+        if root is None:
+            return "", []
+
+        matches = _CONTENT_DIV_XPATH(root)
+        content_div = matches[0] if matches else root.find("body")
+        if content_div is None:
+            content_div = root
+
+        images_found = self._transform_content(content_div, book_id, skip_images, path_prefix)
+
+        # The XML serializer already self-closes void tags and escapes ``&``
+        # in text and attributes; only raw sections (comments, CDATA,
+        # processing instructions) still need the string-level passes.
+        content = self._serialize(content_div)
+        if "<!" in content or "<?" in content:
+            content = self._to_xhtml(content)
+            # Ensure bare ampersands are escaped for XHTML validity
+            content = self._escape_ampersands(content)
+
+        return content, images_found
 
-        content_div = soup.find("div", id="sbo-rt-content")
-        if not content_div:
-            content_div = soup.body or soup
+    @staticmethod
+    def _content_fragment(html: str) -> str:
+        """Drop the page chrome (head, navigation) before the content div.
 
-        self._convert_svg_images(content_div, soup)
+        Only the ``sbo-rt-content`` subtree is kept by ``process``, so the
+        markup ahead of its start tag is never worth tokenizing. The full page
+        is returned when the match could sit inside a comment or raw-text
+        element.
+        """
+        match = _CONTENT_DIV_START_RE.search(html)
+        if match is None or match.start() == 0:
+            return html
+        prefix = html[: match.start()].lower()
+        for opener, closer in _OPAQUE_SECTIONS:
+            if prefix.rfind(opener) > prefix.rfind(closer):
+                return html
+        return html[match.start() :]
 
-        if skip_images:
-            self._remove_images(content_div)
-            images_found = []
-        else:
-            images_found = self._rewrite_image_links(content_div, path_prefix)
+    @staticmethod
+    def _parse_document(html: str) -> Any:
+        """Parse ``html`` into an lxml document root, or ``None`` if it is empty."""
+        try:
+            try:
+                return lxml_html.document_fromstring(html)
+            except ValueError:
+                # lxml refuses str input that carries an XML encoding declaration.
+                return lxml_html.document_fromstring(html.encode("utf-8"))
+        except etree.ParserError:
+            return None
 
-        self._rewrite_href_links(content_div, book_id)
-        self._handle_data_template_styles(content_div)
+    @staticmethod
+    def _serialize(element: Any) -> str:
+        """Serialize ``element`` as markup without its tail text.
 
-        content = self._to_xhtml(str(content_div))
-        # Ensure bare ampersands are escaped for XHTML validity
-        content = self._escape_ampersands(content)
+        The XML serializer is used because the HTML one URI-escapes ``href``
+        and ``src`` values.
+        """
+        return etree.tostring(element, encoding="unicode", with_tail=False)
+
+    def _transform_content(
+        self, content: Any, book_id: str, skip_images: bool = False, path_prefix: str = ""
+    ) -> list[str]:
+        """Apply every per-element rewrite in a single walk over ``content``.
+
+        Returns the original ``src`` of each kept image in document order,
+        interned so repeats across chapters share one string in the
+        downloader's URL set.
+        Empty non-void elements get an empty text node so the XML serializer
+        keeps them as ``<a></a>`` rather than ``<a/>``, which HTML parsers
+        (the PDF renderer) would read as an unclosed start tag, and content
+        libxml2 nested inside void tags is moved after them.
+        """
+        images: list[str] = []
+        # Snapshot first: the walk replaces <svg> wrappers and drops images.
+        for el in list(content.iter(etree.Element)):
+            tag = el.tag
+            if tag == "image":
+                el = self._convert_svg_image(el)
+                if el is None:
+                    continue
+                tag = "img"
 
-        return content, images_found
+            if tag == "img":
+                if skip_images:
+                    self._remove_element(el)
+                    continue
+                src = self._rewrite_image_link(el, path_prefix)
+                if src:
+                    images.append(sys.intern(src))
+            elif tag == "a":
+                self._rewrite_href_link(el, book_id)
+            elif tag == "style":
+                self._handle_data_template_style(el)
+
+            epub_type = el.get("epub:type")
+            if epub_type and "ibooks:" in epub_type:
+                self._strip_ibooks_epub_type(el, epub_type)
+
+            if tag in _VOID_TAGS:
+                if el.text or len(el):
+                    self._hoist_void_content(el)
+            elif el.text is None and len(el) == 0:
+                el.text = ""
 
-    def _remove_images(self, soup: Any) -> None:
-        """Remove all img tags from content"""
-        for img in soup.find_all("img"):
-            img.decompose()
+        return images
 
-    def _convert_svg_images(self, content_div: Any, soup: Any) -> None:
-        for image_tag in content_div.find_all("image"):
-            href = image_tag.get("href") or image_tag.get("xlink:href")
-            if not href:
-                continue
+    @staticmethod
+    def _hoist_void_content(el: Any) -> None:
+        """Move content nested inside a void tag to just after it.
 
-            img_tag = soup.new_tag("img", src=href)
-            parent = image_tag.parent
-            if parent and parent.name == "svg":
-                for attr in ("width", "height", "viewbox"):
-                    if parent.has_attr(attr):
-                        img_tag[attr] = parent[attr]
-                parent.replace_with(img_tag)
-            else:
-                image_tag.replace_with(img_tag)
+        libxml2 predates HTML5 and parses ``<source>``, ``<track>``, ``<wbr>``
+        and ``<embed>`` as containers; an HTML5 parser leaves what follows
+        them as siblings.
+        """
+        parent = el.getparent()
+        if parent is None:
+            return
+        children = list(el)
+        tail = el.tail
+        el.tail = el.text
+        el.text = None
+        index = parent.index(el)
+        for offset, child in enumerate(children, 1):
+            parent.insert(index + offset, child)
+        last = children[-1] if children else el
+        last.tail = ((last.tail or "") + (tail or "")) or None
 
-    def _rewrite_image_links(self, soup: Any, path_prefix: str = "") -> list[str]:
-        images: list[str] = []
-        for img in soup.find_all("img"):
-            src = img.get("src", "")
-            if not src:
-                continue
+    @staticmethod
+    def _remove_element(el: Any) -> None:
+        """Drop ``el`` (keeping its tail text) without leaving ``<parent/>``."""
+        parent = el.getparent()
+        if parent is None:
+            return
+        el.drop_tree()
+        if parent.text is None and len(parent) == 0:
+            parent.text = ""
 
-            filename = src.split("/")[-1]
-            img["src"] = f"{path_prefix}Images/{filename}"
-            images.append(src)
+    @staticmethod
+    def _convert_svg_image(image_tag: Any) -> Any | None:
+        """Replace an SVG ``<image>`` (or its ``<svg>`` wrapper) with an ``<img>``."""
+        href = image_tag.get("href") or image_tag.get("xlink:href")
+        if not href:
+            return None
 
-        return images
+        img_tag = image_tag.makeelement("img", src=href)
+        target = image_tag
+        parent = image_tag.getparent()
+        if parent is not None and parent.tag == "svg":
+            for attr in ("width", "height", "viewbox"):
+                if attr in parent.attrib:
+                    img_tag.set(attr, parent.get(attr))
+            target = parent
+
+        container = target.getparent()
+        if container is None:
+            # Already detached by an earlier replacement in the same <svg>.
+            return None
+        img_tag.tail = target.tail
+        container.replace(target, img_tag)
+        return img_tag
+
+    @staticmethod
+    def _rewrite_image_link(img: Any, path_prefix: str = "") -> str | None:
+        """Point ``img`` at its local copy and return the original ``src``."""
+        src = img.get("src", "")
+        if not src:
+            return None
+
+        filename = src.split("/")[-1]
+        img.set("src", f"{path_prefix}Images/{filename}")
+        return src
 
     # ---- string-level rewriters (also used directly by tests) ----------
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def image_filename_from_url(url: str) -> str | None:
         """Return a stable, safe filename for a remote image URL.
 
@@ -129,20 +290,31 @@ class HtmlProcessorPlugin(Plugin):
         ``!`` and other unsafe characters are replaced with ``_`` and the
         last segment before the extension is suffixed with ``-`` to
         disambiguate between assets that share a name on different paths.
+
+        Results are cached: shared figures and icons repeat across chapters.
         """
         if not url:
             return None
-        from urllib.parse import urlparse
-
-        parsed = urlparse(url)
-        path = parsed.path
-        if not path or path == "/":
-            return None
-        basename = path.rsplit("/", 1)[-1]
+        if (
+            url.startswith(("https://", "http://"))
+            and url.isascii()
+            and url.isprintable()
+            and " " not in url
+            and "[" not in url
+            and "]" not in url
+        ):
+            # Plain http(s) URL that urlparse() would not clean up or validate:
+            # slice the path out directly, splitting ``;params`` off the last
+            # segment the way urlparse() does.
+            path = url.split("#", 1)[0].split("?", 1)[0]
+            path = path[path.index("://") + 3 :]
+            basename = path.rpartition("/")[2].split(";", 1)[0] if "/" in path else ""
+        else:
+            basename = urlparse(url).path.rpartition("/")[2]
         if not basename or "." not in basename:
             return None
-        stem, ext = basename.rsplit(".", 1)
-        safe_stem = re.sub(r"[^A-Za-z0-9_-]", "_", stem).strip("_")
+        stem, _, ext = basename.rpartition(".")
+        safe_stem = _UNSAFE_STEM_CHARS_RE.sub("_", stem).strip("_")
         if not safe_stem:
             return None
         return f"{safe_stem}-.{ext.lower()}"
@@ -157,8 +329,6 @@ class HtmlProcessorPlugin(Plugin):
         """
         if not url:
             return "", url
-        from urllib.parse import urljoin
-
         absolute = urljoin(base_url, url) if base_url else url
         filename = HtmlProcessorPlugin.image_filename_from_url(absolute) or "image.bin"
         return f"Images/{filename}", absolute
@@ -169,21 +339,25 @@ class HtmlProcessorPlugin(Plugin):
 
         Each candidate is rewritten through :meth:`_rewrite_image_value` and
         joined back into a ``srcset`` string. The original URLs are returned
-        so the downloader can fetch them all.
+        so the downloader can fetch them all. Candidates repeating a URL
+        (the same file at several descriptors) are resolved once.
         """
         if not srcset:
             return srcset, []
         rewritten_candidates: list[str] = []
         originals: list[str] = []
+        resolved: dict[str, tuple[str, str]] = {}
         for chunk in srcset.split(","):
-            chunk = chunk.strip()
-            if not chunk:
+            # ``split()`` strips the chunk; only the URL and first descriptor are kept.
+            parts = chunk.split(None, 2)
+            if not parts:
                 continue
-            parts = chunk.split()
             url = parts[0]
-            descriptor = parts[1] if len(parts) > 1 else ""
-            local, original = HtmlProcessorPlugin._rewrite_image_value(url, base_url)
-            rewritten_candidates.append(f"{local} {descriptor}".strip())
+            pair = resolved.get(url)
+            if pair is None:
+                pair = resolved[url] = HtmlProcessorPlugin._rewrite_image_value(url, base_url)
+            local, original = pair
+            rewritten_candidates.append(f"{local} {parts[1]}" if len(parts) > 1 else local)
             originals.append(original)
         return ", ".join(rewritten_candidates), originals
 
@@ -197,8 +371,6 @@ class HtmlProcessorPlugin(Plugin):
         """
         if not url:
             return url
-        from urllib.parse import urlsplit, urlunsplit
-
         if url.startswith(("http://", "https://")):
             if book_id not in url:
                 return url
@@ -213,52 +385,55 @@ class HtmlProcessorPlugin(Plugin):
             path = urlunsplit(parts._replace(path=new_path))
         return path
 
-    def _rewrite_href_links(self, soup: Any, book_id: str) -> None:
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
+    @staticmethod
+    def _rewrite_href_link(a: Any, book_id: str) -> None:
+        href = a.get("href")
+        if href is None:
+            return
 
-            if href.startswith("mailto:"):
-                continue
+        if href.startswith("mailto:"):
+            return
 
-            if href.startswith(("http://", "https://")):
-                if book_id in href:
-                    path = href.split(book_id)[-1].lstrip("/")
-                    href = path
-                else:
-                    continue
+        if href.startswith(("http://", "https://")):
+            if book_id in href:
+                path = href.split(book_id)[-1].lstrip("/")
+                href = path
+            else:
+                return
 
-            # Replace .html with .xhtml even when there's a fragment
-            if ".html" in href:
-                parts = urlsplit(href)
-                path = parts.path.replace(".html", ".xhtml")
-                href = urlunsplit(parts._replace(path=path))
-
-            # Escape & in href for XHTML validity
-            if "&" in href and "&amp;" not in href:
-                href = href.replace("&", "&amp;")
-
-            a["href"] = href
-
-    def _handle_data_template_styles(self, soup: Any) -> None:
-        for style in soup.find_all("style"):
-            if style.has_attr("data-template"):
-                css_text = style["data-template"]
-                # Use CDATA so raw CSS characters (<, &, >) do not break XXML well-formedness
-                style.string = CData(css_text)
-                del style["data-template"]
-
-        for tag in soup.find_all(attrs={"epub:type": True}):
-            epub_type = tag.get("epub:type", "")
-            if "ibooks:" in epub_type:
-                tag["epub:type"] = " ".join(
-                    value for value in epub_type.split() if not value.startswith("ibooks:")
-                )
-                if not tag["epub:type"]:
-                    del tag["epub:type"]
+        # Replace .html with .xhtml even when there's a fragment
+        if ".html" in href:
+            parts = urlsplit(href)
+            path = parts.path.replace(".html", ".xhtml")
+            href = urlunsplit(parts._replace(path=path))
 
-    def wrap_xhtml(self, content: str, css_files: list[str], title: str = "") -> str:
-        import html as html_module
+        # Escape & in href for XHTML validity
+        if "&" in href and "&amp;" not in href:
+            href = href.replace("&", "&amp;")
+
+        a.set("href", href)
+
+    @staticmethod
+    def _handle_data_template_style(style: Any) -> None:
+        css_text = style.get("data-template")
+        if css_text is None:
+            return
+        for child in list(style):
+            style.remove(child)
+        # Use CDATA so raw CSS characters (<, &, >) do not break XXML well-formedness
+        style.text = etree.CDATA(css_text)
+        del style.attrib["data-template"]
 
+    @staticmethod
+    def _strip_ibooks_epub_type(tag: Any, epub_type: str) -> None:
+        """Drop Apple-only ``ibooks:`` values from an ``epub:type`` attribute."""
+        cleaned = " ".join(value for value in epub_type.split() if not value.startswith("ibooks:"))
+        if cleaned:
+            tag.set("epub:type", cleaned)
+        else:
+            del tag.attrib["epub:type"]
+
+    def wrap_xhtml(self, content: str, css_files: list[str], title: str = "") -> str:
         css_links = "\n".join(
             f'<link href="{css}" rel="stylesheet" type="text/css"/>' for css in css_files
         )
@@ -302,11 +477,7 @@ body{{margin:1em;background-color:transparent!important;}}
             if found:
                 rules.extend(found)
                 # Strip content:url() from CSS to avoid duplicates
-                cleaned = re.sub(
-                    r"content\s*:\s*url\([^)]+\)",
-                    'content:""',
-                    css_text,
-                )
+                cleaned = _CSS_CONTENT_URL_RE.sub('content:""', css_text)
                 css_path.write_text(cleaned, encoding="utf-8")
 
         if not rules:
@@ -326,10 +497,7 @@ body{{margin:1em;background-color:transparent!important;}}
         Copies referenced images to Images/ so they appear in the EPUB manifest.
         """
         results: list[tuple[str, str, bool]] = []
-        for match in re.finditer(
-            r'([^{}]+?)\s*\{[^}]*?content\s*:\s*url\(["\']?([^)"\']+)["\']?\)[^}]*\}',
-            css_text,
-        ):
+        for match in _CSS_CONTENT_URL_RULE_RE.finditer(css_text):
             selector_raw = match.group(1).strip()
             url_ref = match.group(2)
             if url_ref.startswith("data:"):
@@ -338,7 +506,7 @@ body{{margin:1em;background-color:transparent!important;}}
             is_before = ":before" in selector_raw
 
             # Strip pseudo-element to get the base selector
-            selector = re.sub(r"::?(before|after)", "", selector_raw).strip()
+            selector = _CSS_PSEUDO_ELEMENT_RE.sub("", selector_raw).strip()
             if not selector:
                 continue
 
@@ -389,23 +557,6 @@ body{{margin:1em;background-color:transparent!important;}}
         if modified:
             xhtml_path.write_text(self._to_xhtml(str(soup)), encoding="utf-8")
 
-    def detect_cover_image(self, soup: Any) -> str | None:
-        for img in soup.find_all("img"):
-            src = img.get("src", "").lower()
-            alt = img.get("alt", "").lower()
-            img_id = img.get("id", "").lower()
-            img_class = " ".join(img.get("class", [])).lower()
-
-            if any("cover" in x for x in [src, alt, img_id, img_class]):
-                return img.get("src")
-
-        for div in soup.find_all("div"):
-            div_id = div.get("id", "").lower()
-            div_class = " ".join(div.get("class", [])).lower()
-
-            if "cover" in div_id or "cover" in div_class:
-                img = div.find("img")
-                if img:
-                    return img.get("src")
-
-        return None
+    def detect_cover_image(self, tree: Any) -> str | None:
+        hits = _COVER_IMG_XPATH(tree) or _COVER_DIV_IMG_XPATH(tree)
+        return hits[0].get("src") if hits else None
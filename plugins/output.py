@@ -1,5 +1,6 @@
 """Output directory management plugin."""
 
+import os
 from pathlib import Path
 
 import config
@@ -39,7 +40,12 @@ class OutputPlugin(Plugin):
         if not path.is_dir():
             return False, "Path is not a directory", None
 
-        # Check writability
+        # Check writability. os.access is a single syscall on POSIX; Windows
+        # ignores ACLs there, so it still gets the real write probe.
+        if os.name != "nt":
+            if not os.access(path, os.W_OK | os.X_OK):
+                return False, "Directory is not writable", None
+            return True, "Directory is valid", path
         try:
             test_file = path / ".write_test"
             test_file.touch()
@@ -94,26 +100,36 @@ class OutputPlugin(Plugin):
         numeric suffix (``repeated-title-2``, ``repeated-title-3``, ...). If
         the existing directory is the same book, reuse it. If the directory
         exists but has no ``.book_id`` (legacy layout), keep the slugified
-        name unchanged so the original contents are preserved.
+        name unchanged so the original contents are preserved. A suffixed
+        directory that already holds this ``book_id`` is reused as well.
         """
         if not book_dir.exists():
             return book_dir
-        meta_file = book_dir / ".book_id"
-        if meta_file.exists():
-            existing_id = meta_file.read_text().strip()
-            if existing_id == book_id:
-                return book_dir
-            # Different book with same title — find a free numeric suffix.
-            parent = book_dir.parent
-            base = book_dir.name
-            counter = 2
-            while True:
-                candidate = parent / f"{base}-{counter}"
-                if not candidate.exists():
-                    return candidate
-                counter += 1
-        # Directory exists but is a legacy / unknown layout — leave it alone.
-        return book_dir
+        existing_id = self._read_book_id(book_dir)
+        if existing_id is None or existing_id == book_id:
+            # Same book, or a legacy / unknown layout — leave it alone.
+            return book_dir
+
+        # Different book with same title — list the siblings once instead of
+        # stat-ing every candidate, and only read markers of taken names.
+        parent = book_dir.parent
+        base = book_dir.name
+        with os.scandir(parent) as entries:
+            taken = {entry.name for entry in entries if entry.name.startswith(base)}
+        counter = 2
+        while True:
+            candidate = parent / f"{base}-{counter}"
+            if candidate.name not in taken or self._read_book_id(candidate) == book_id:
+                return candidate
+            counter += 1
+
+    @staticmethod
+    def _read_book_id(book_dir: Path) -> str | None:
+        """Return the ``.book_id`` marker of ``book_dir``, or None when absent."""
+        try:
+            return (book_dir / ".book_id").read_bytes().strip().decode("utf-8", "ignore")
+        except OSError:
+            return None
 
     def get_oebps_dir(self, book_dir: Path) -> Path:
         """Get the OEBPS directory for a book."""
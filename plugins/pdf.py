@@ -1,10 +1,15 @@
 """PDF generation plugin using WeasyPrint."""
 
 import html
+import multiprocessing
 import os
 import re
 import sys
-from pathlib import Path
+import tempfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path, PurePath
 from typing import Any
 from urllib.parse import unquote, urlparse
 
@@ -12,6 +17,84 @@ from utils.files import sanitize_filename
 
 from .base import Plugin
 
+# Below this many chapters, worker start-up (each one imports WeasyPrint)
+# costs more than rendering in-process.
+_PARALLEL_RENDER_MIN_CHAPTERS = 3
+# Each render worker holds its own WeasyPrint/Pango stack, so memory grows
+# with the worker count; a few cores already cover most of the speed-up.
+_MAX_RENDER_WORKERS = 4
+# How often a parallel render wakes up to check for cancellation.
+_RENDER_CANCEL_POLL_SECONDS = 0.5
+
+# Stylesheet reads are overlapped on a few threads once a book has several.
+_PARALLEL_READ_MIN_FILES = 4
+_MAX_READ_WORKERS = 8
+
+# WeasyPrint emits the PDF as many small writes; buffer them in large chunks.
+_PDF_WRITE_BUFFER_SIZE = 1 << 20
+
+_BODY_RE = re.compile(rb"<body[^>]*>(.*?)</body>", re.DOTALL | re.IGNORECASE)
+_CSS_URL_RE = re.compile(r'url\(["\']?([^)"\']+)["\']?\)')
+
+
+@lru_cache(maxsize=4096)
+def _href_stem(href: str) -> str:
+    """Return the file stem used as a chapter anchor id.
+
+    TOC entries that point into the same chapter share an href, so the
+    parse is cached; distinct hrefs per book are bounded by its chapters.
+    """
+    return PurePath(href).stem
+
+
+@lru_cache(maxsize=4096)
+def _toc_anchor_id(reference: str) -> str:
+    """Return the chapter anchor id for a TOC ``reference_id``.
+
+    References look like ``urn:orm:book:123/-/ch001.html``; only the part
+    after the last ``-/`` names the chapter file.
+    """
+    if "-/" in reference:
+        reference = reference.rpartition("-/")[2]
+    return _href_stem(reference)
+
+
+@lru_cache(maxsize=1)
+def _read_print_css() -> str | None:
+    """Return the bundled ``print.css``, or ``None`` if it is missing.
+
+    The file ships with the package, so it is read once per process.
+    """
+    css_path = Path(__file__).parent / "pdf_styles" / "print.css"
+    try:
+        return css_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _read_css_file(path: str, mtime_ns: int) -> str:
+    """Read a book stylesheet; ``mtime_ns`` invalidates the cached text."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def _read_css_if_present(css_path: Path) -> str | None:
+    """Return a stylesheet's text, or ``None`` if it does not exist."""
+    try:
+        mtime_ns = css_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_css_file(str(css_path), mtime_ns)
+
+
+def _read_css_files(paths: list[Path]) -> list[str | None]:
+    """Read stylesheets in order (``None`` when missing), overlapping the I/O."""
+    workers = min(_MAX_READ_WORKERS, os.cpu_count() or 1, len(paths))
+    if len(paths) < _PARALLEL_READ_MIN_FILES or workers < 2:
+        return [_read_css_if_present(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_read_css_if_present, paths))
+
 
 def restricted_url_fetcher(book_dir: Path) -> Any:
     """Build a WeasyPrint fetcher limited to data URLs and files in ``book_dir``."""
@@ -39,12 +122,69 @@ def restricted_url_fetcher(book_dir: Path) -> Any:
     return RestrictedURLFetcher(allowed_protocols=("data", "file"), allow_redirects=False)
 
 
+def _write_pdf(html_doc: Any, pdf_path: str | Path, stylesheets: list[Any] | None = None) -> None:
+    """Lay out ``html_doc`` and write it to ``pdf_path`` through a large buffer.
+
+    Layout runs before the file is opened so a failed render leaves no
+    empty PDF behind.
+    """
+    document = html_doc.render(stylesheets=stylesheets)
+    with open(pdf_path, "wb", buffering=_PDF_WRITE_BUFFER_SIZE) as fh:
+        document.write_pdf(fh)
+
+
+# Chapter rendering context: (base_url, url_fetcher, stylesheets).
+_ChapterRenderer = tuple[str, Any, list[Any]]
+
+# Set only by the pool initializer, once per spawned worker process.
+_chapter_renderer: _ChapterRenderer | None = None
+
+
+def _build_chapter_renderer(
+    base_url: str, book_dir: str, css_texts: tuple[str, ...]
+) -> _ChapterRenderer:
+    """Parse the stylesheets shared by every chapter of one book."""
+    weasyprint = PdfPlugin().weasyprint
+    url_fetcher = restricted_url_fetcher(Path(book_dir))
+    stylesheets = [
+        weasyprint.CSS(string=css_text, base_url=base_url, url_fetcher=url_fetcher)
+        for css_text in css_texts
+        if css_text
+    ]
+    return (base_url, url_fetcher, stylesheets)
+
+
+def _init_chapter_renderer(base_url: str, book_dir: str, css_texts: tuple[str, ...]) -> None:
+    """Pool initializer: build the chapter renderer once for this worker process."""
+    global _chapter_renderer
+    _chapter_renderer = _build_chapter_renderer(base_url, book_dir, css_texts)
+
+
+def _render_chapter_pdf_with(renderer: _ChapterRenderer, job: tuple[str, str]) -> None:
+    """Render one chapter document to PDF with ``renderer``."""
+    chapter_html, pdf_path = job
+    base_url, url_fetcher, stylesheets = renderer
+    html_doc = PdfPlugin().weasyprint.HTML(
+        string=chapter_html, base_url=base_url, url_fetcher=url_fetcher
+    )
+    _write_pdf(html_doc, pdf_path, stylesheets)
+
+
+def _render_chapter_pdf(job: tuple[str, str]) -> None:
+    """Render one chapter document to PDF; runs in a worker process."""
+    if _chapter_renderer is None:
+        raise RuntimeError("_init_chapter_renderer must run before rendering chapters")
+    _render_chapter_pdf_with(_chapter_renderer, job)
+
+
 class PdfPlugin(Plugin):
     """Generates PDF from downloaded book content using WeasyPrint."""
 
-    def __init__(self):
-        self._weasyprint = None
-        self._dll_directory_handles = []
+    # Every download job builds a fresh kernel (and so a fresh plugin), so the
+    # WeasyPrint import and GTK DLL setup are cached on the class and paid
+    # once per process instead of once per download.
+    _weasyprint: Any = None
+    _dll_directory_handles: list[Any] = []
 
     def _prepare_windows_gtk_path(self):
         """Make GTK runtime DLLs visible to WeasyPrint on Windows.
@@ -79,7 +219,7 @@ class PdfPlugin(Plugin):
 
             if hasattr(os, "add_dll_directory"):
                 # Keep the returned handle alive for the process lifetime.
-                self._dll_directory_handles.append(os.add_dll_directory(candidate))
+                PdfPlugin._dll_directory_handles.append(os.add_dll_directory(candidate))
 
             try:
                 import ctypes
@@ -93,12 +233,12 @@ class PdfPlugin(Plugin):
     @property
     def weasyprint(self):
         """Lazy import WeasyPrint to avoid import errors if not installed."""
-        if self._weasyprint is None:
+        if PdfPlugin._weasyprint is None:
             try:
                 self._prepare_windows_gtk_path()
                 import weasyprint
 
-                self._weasyprint = weasyprint
+                PdfPlugin._weasyprint = weasyprint
             except (ImportError, OSError) as e:
                 error_text = str(e)
                 if "cffLib" in error_text and "fontTools" in error_text:
@@ -117,7 +257,7 @@ class PdfPlugin(Plugin):
                     "System dependencies (macOS): brew install pango\n"
                     "System dependencies (Ubuntu): apt install libpango-1.0-0 libharfbuzz0b libpangoft2-1.0-0"
                 ) from e
-        return self._weasyprint
+        return PdfPlugin._weasyprint
 
     def generate(
         self,
@@ -145,25 +285,38 @@ class PdfPlugin(Plugin):
         output_dir = Path(output_dir)
         oebps = output_dir / "OEBPS"
 
-        html_content = self._build_combined_html(
-            book_info=book_info,
-            chapters=chapters,
-            toc=toc,
-            oebps=oebps,
-            css_files=css_files,
-            cover_image=cover_image,
-        )
-
         title = book_info.get("title", "book")
         safe_title = sanitize_filename(title)
         pdf_path = output_dir / f"{safe_title}.pdf"
 
-        html_doc = self.weasyprint.HTML(
-            string=html_content,
-            base_url=str(oebps),
-            url_fetcher=restricted_url_fetcher(output_dir),
+        # Stream the combined document to disk chapter by chapter so the
+        # whole book never sits in memory as one string next to WeasyPrint's
+        # own tree. It lives in the system temp dir (base_url is explicit), so
+        # a crashed render leaves nothing behind in the book folder.
+        html_file = tempfile.NamedTemporaryFile(  # noqa: SIM115
+            "w", encoding="utf-8", suffix=".html", delete=False
         )
-        html_doc.write_pdf(str(pdf_path))
+        html_path = Path(html_file.name)
+        try:
+            with html_file:
+                html_file.writelines(
+                    self._iter_combined_html(
+                        book_info=book_info,
+                        chapters=chapters,
+                        toc=toc,
+                        oebps=oebps,
+                        css_files=css_files,
+                        cover_image=cover_image,
+                    )
+                )
+            html_doc = self.weasyprint.HTML(
+                filename=str(html_path),
+                base_url=str(oebps),
+                url_fetcher=restricted_url_fetcher(output_dir),
+            )
+            _write_pdf(html_doc, pdf_path)
+        finally:
+            html_path.unlink(missing_ok=True)
 
         return pdf_path
 
@@ -173,6 +326,7 @@ class PdfPlugin(Plugin):
         chapters: list[dict],
         output_dir: Path,
         css_files: list[str],
+        cancel_check: Callable[[], bool] | None = None,
     ) -> list[Path]:
         """
         Generate individual PDF files for each chapter.
@@ -182,6 +336,8 @@ class PdfPlugin(Plugin):
             chapters: List of chapter dicts with filename, title, order
             output_dir: Path to output/{book_id}/ directory
             css_files: List of CSS filenames in OEBPS/Styles/
+            cancel_check: Optional callable; once it returns True no further
+                chapters are started
 
         Returns:
             List of paths to generated PDF files
@@ -196,13 +352,14 @@ class PdfPlugin(Plugin):
         original_css = self._load_css_files(oebps, css_files)
 
         pdf_paths: list[Path] = []
+        jobs: list[tuple[str, str]] = []
 
-        for i, chapter in enumerate(chapters):
-            xhtml_path = self._safe_chapter_path(oebps, chapter["filename"])
-            if not xhtml_path.exists():
+        chapter_paths = self._chapter_paths(oebps, chapters)
+        for i, (chapter, xhtml_path) in enumerate(zip(chapters, chapter_paths, strict=True)):
+            try:
+                body = self._extract_chapter_body(xhtml_path)
+            except FileNotFoundError:
                 continue
-
-            body = self._extract_chapter_body(xhtml_path)
             chapter_title = self._escape_html(chapter.get("title", f"Chapter {i + 1}"))
 
             chapter_html = f"""<!DOCTYPE html>
@@ -210,8 +367,6 @@ class PdfPlugin(Plugin):
 <head>
     <meta charset="utf-8">
     <title>{chapter_title}</title>
-    <style>{print_css}</style>
-    <style>{original_css}</style>
 </head>
 <body>
     <section class="chapter">
@@ -225,17 +380,66 @@ class PdfPlugin(Plugin):
             pdf_filename = f"{i + 1:03d}_{safe_title}.pdf"
             pdf_path = pdf_dir / pdf_filename
 
-            html_doc = self.weasyprint.HTML(
-                string=chapter_html,
-                base_url=str(oebps),
-                url_fetcher=restricted_url_fetcher(output_dir),
-            )
-            html_doc.write_pdf(str(pdf_path))
+            jobs.append((chapter_html, str(pdf_path)))
             pdf_paths.append(pdf_path)
 
+        renderer_args = (str(oebps), str(output_dir), (print_css, original_css))
+        self._render_chapter_pdfs(jobs, renderer_args, cancel_check)
         return pdf_paths
 
-    def _build_combined_html(
+    def _render_chapter_pdfs(
+        self,
+        jobs: list[tuple[str, str]],
+        renderer_args: tuple[str, str, tuple[str, ...]],
+        cancel_check: Callable[[], bool] | None = None,
+    ) -> None:
+        """Render chapter documents, spreading them over CPU cores when it pays off.
+
+        WeasyPrint layout is pure-Python CPU work, so threads would serialize
+        on the GIL. Workers are spawned rather than forked because downloads
+        run on a background thread of the server process. The print and book
+        stylesheets are parsed once per call (once per worker in the pool) and
+        applied to every chapter as WeasyPrint user stylesheets instead of
+        being inlined and re-parsed per chapter.
+        """
+        # Import in this process first so a missing dependency raises the
+        # detailed error instead of a worker traceback.
+        _ = self.weasyprint
+
+        def cancelled() -> bool:
+            return bool(cancel_check and cancel_check())
+
+        workers = min(len(jobs), os.cpu_count() or 1, _MAX_RENDER_WORKERS)
+        if len(jobs) < _PARALLEL_RENDER_MIN_CHAPTERS or workers < 2:
+            # A local renderer keeps concurrent renders in this process apart
+            # and is dropped with this call.
+            renderer = _build_chapter_renderer(*renderer_args)
+            for job in jobs:
+                if cancelled():
+                    return
+                _render_chapter_pdf_with(renderer, job)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chapter_renderer,
+            initargs=renderer_args,
+        )
+        try:
+            pending = {executor.submit(_render_chapter_pdf, job) for job in jobs}
+            while pending and not cancelled():
+                done, pending = wait(
+                    pending, timeout=_RENDER_CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+        finally:
+            # Chapters already rendering finish; queued ones are dropped on
+            # cancellation or after the first failure.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _iter_combined_html(
         self,
         book_info: dict,
         chapters: list[dict],
@@ -243,47 +447,55 @@ class PdfPlugin(Plugin):
         oebps: Path,
         css_files: list[str],
         cover_image: str | None,
-    ) -> str:
-        """Build single HTML document combining all chapters."""
+    ) -> Iterator[str]:
+        """Yield the single HTML document combining all chapters, piece by piece.
+
+        Each chapter body is read only when the consumer asks for it, so at
+        most one body is held at a time.
+        """
         print_css = self._get_print_css()
         original_css = self._load_css_files(oebps, css_files)
 
         cover_html = self._generate_cover_html(book_info, cover_image)
         toc_html = self._generate_toc_html(toc, chapters)
-
-        chapters_html_parts: list[str] = []
-
-        for chapter in chapters:
-            xhtml_path = self._safe_chapter_path(oebps, chapter["filename"])
-            if not xhtml_path.exists():
-                continue
-
-            body = self._extract_chapter_body(xhtml_path)
-            chapter_id = Path(chapter["filename"]).stem
-            chapter_class = "chapter chapter-first" if not chapters_html_parts else "chapter"
-
-            chapters_html_parts.append(f'''
-    <section class="{chapter_class}" id="{chapter_id}">
-        {body}
-    </section>''')
-
-        chapters_html = "\n".join(chapters_html_parts)
         title = self._escape_html(book_info.get("title", "Untitled"))
 
-        return f"""<!DOCTYPE html>
+        yield f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <title>{title}</title>
-    <style>{print_css}</style>
-    <style>{original_css}</style>
+    <style>"""
+        yield print_css
+        yield """</style>
+    <style>"""
+        yield original_css
+        yield f"""</style>
 </head>
 <body>
     {cover_html}
     {toc_html}
-    {chapters_html}
-</body>
-</html>"""
+    """
+        chapter_class = "chapter chapter-first"
+
+        chapter_paths = self._chapter_paths(oebps, chapters)
+        for chapter, xhtml_path in zip(chapters, chapter_paths, strict=True):
+            try:
+                body = self._extract_chapter_body(xhtml_path)
+            except FileNotFoundError:
+                continue
+            chapter_id = _href_stem(chapter["filename"])
+            if chapter_class == "chapter":
+                yield "\n"
+
+            yield f'''
+    <section class="{chapter_class}" id="{chapter_id}">
+        '''
+            yield body
+            yield "\n    </section>"
+            chapter_class = "chapter"
+
+        yield "\n</body>\n</html>"
 
     def _generate_cover_html(
         self,
@@ -317,16 +529,16 @@ class PdfPlugin(Plugin):
         if not toc:
             return ""
 
+        escape = html.escape
+
         def render_item(item: dict) -> str:
-            title = self._escape_html(item.get("title", "Untitled"))
+            # Inlined _escape_html: this runs once per TOC node.
+            title = item.get("title", "Untitled")
+            title = escape(str(title)) if title else ""
 
-            # Get href from reference_id and convert to chapter ID
             href = item.get("reference_id", "")
             if href:
-                # Extract filename from reference like "urn:orm:book:123/-/ch001.html"
-                if "-/" in href:
-                    href = href.split("-/")[-1]
-                chapter_id = Path(href).stem
+                chapter_id = _toc_anchor_id(href)
                 link = f'<a href="#{chapter_id}">{title}</a>'
             else:
                 link = title
@@ -349,46 +561,63 @@ class PdfPlugin(Plugin):
     </section>"""
 
     def _extract_chapter_body(self, xhtml_path: Path) -> str:
-        """Extract body content from XHTML file."""
-        content = xhtml_path.read_text(encoding="utf-8")
+        """Extract body content from XHTML file.
+
+        The file is searched as bytes and only the body is decoded.
+        """
+        content = xhtml_path.read_bytes()
+
+        # Chapters written by HtmlProcessorPlugin.wrap_xhtml use a lowercase
+        # <body>; slice it out with bytes.find before trying the regex.
+        start = content.find(b"<body")
+        if start != -1:
+            open_end = content.find(b">", start)
+            close = content.find(b"</body>", open_end)
+            if open_end != -1 and close != -1:
+                return content[open_end + 1 : close].decode("utf-8")
 
         # Find <body> content
-        body_match = re.search(
-            r"<body[^>]*>(.*?)</body>",
-            content,
-            re.DOTALL | re.IGNORECASE,
-        )
+        body_match = _BODY_RE.search(content)
 
         if body_match:
-            return body_match.group(1)
+            return body_match.group(1).decode("utf-8")
 
-        return content
+        return content.decode("utf-8")
 
     @staticmethod
-    def _safe_chapter_path(oebps: Path, filename: str) -> Path:
+    def _chapter_paths(oebps: Path, chapters: list[dict]) -> list[Path]:
+        """Resolve every chapter's XHTML path inside ``oebps`` in one pass.
+
+        ``oebps`` is resolved once per book instead of once per chapter, and
+        a chapter escaping the book directory is rejected before any work.
+        """
         root = oebps.resolve()
-        candidate = (root / str(filename).replace(".html", ".xhtml")).resolve()
-        try:
-            candidate.relative_to(root)
-        except ValueError as exc:
-            raise ValueError("Chapter path escapes the book directory") from exc
-        return candidate
+        paths: list[Path] = []
+        for chapter in chapters:
+            candidate = (root / chapter["filename"].replace(".html", ".xhtml")).resolve()
+            try:
+                candidate.relative_to(root)
+            except ValueError as exc:
+                raise ValueError("Chapter path escapes the book directory") from exc
+            paths.append(candidate)
+        return paths
 
     def _load_css_files(self, oebps: Path, css_files: list[str]) -> str:
         """Load and concatenate CSS files."""
         css_parts = []
         styles_dir = oebps / "Styles"
+        css_paths = [styles_dir / f"Style{i:02d}.css" for i in range(len(css_files))]
 
-        for i, _ in enumerate(css_files):
-            css_path = styles_dir / f"Style{i:02d}.css"
-            if css_path.exists():
-                css_text = css_path.read_text(encoding="utf-8")
-                css_text = self._resolve_css_urls(css_text, css_path, oebps)
-                css_parts.append(css_text)
+        for css_path, css_text in zip(css_paths, _read_css_files(css_paths), strict=True):
+            if css_text is None:
+                continue
+            css_parts.append(self._resolve_css_urls(css_text, css_path, oebps))
 
         return "\n".join(css_parts)
 
     def _resolve_css_urls(self, css_text: str, css_file_path: Path, base_dir: Path) -> str:
+        if "url(" not in css_text:
+            return css_text
         css_dir = css_file_path.parent
 
         def replacer(m):
@@ -407,13 +636,13 @@ class PdfPlugin(Plugin):
                 return m.group(0)
             return f'url("{rel_path.as_posix()}")'
 
-        return re.sub(r'url\(["\']?([^)"\']+)["\']?\)', replacer, css_text)
+        return _CSS_URL_RE.sub(replacer, css_text)
 
     def _get_print_css(self) -> str:
         """Return print-specific CSS for PDF generation."""
-        css_path = Path(__file__).parent / "pdf_styles" / "print.css"
-        if css_path.exists():
-            return css_path.read_text(encoding="utf-8")
+        print_css = _read_print_css()
+        if print_css is not None:
+            return print_css
 
         # Fallback inline CSS if file doesn't exist
         return self._get_fallback_print_css()
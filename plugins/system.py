@@ -3,37 +3,56 @@
 import platform
 import shutil
 import subprocess  # nosec B404
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
+from typing import ClassVar
 
 from plugins.base import Plugin
 
+_PLATFORM = platform.system()
+
+_WINDOWS_PICKER_PS1 = """
+Add-Type -AssemblyName System.Windows.Forms
+$dialog = New-Object System.Windows.Forms.FolderBrowserDialog
+$dialog.Description = "Select Download Folder"
+$dialog.ShowNewFolderButton = $true
+if ($dialog.ShowDialog() -eq [System.Windows.Forms.DialogResult]::OK) {
+    Write-Output $dialog.SelectedPath
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def _resolve_linux_picker() -> str | None:
+    """Return the first available Linux dialog tool, resolved once per process."""
+    for tool in ("zenity", "kdialog"):
+        if shutil.which(tool):
+            return tool
+    return None
+
 
 class SystemPlugin(Plugin):
     """Platform-specific system operations (dialogs, file manager)."""
 
     def get_platform(self) -> str:
         """Return the current platform identifier."""
-        return platform.system()
+        return _PLATFORM
 
     def show_folder_picker(self, initial_dir: Path | str | None = None) -> Path | None:
         """Show native folder picker dialog."""
-        system = self.get_platform()
+        picker = self._FOLDER_PICKERS.get(self.get_platform())
+        if picker is None:
+            return None
         initial = str(initial_dir) if initial_dir else None
 
         try:
-            if system == "Darwin":
-                return self._show_macos_picker(initial)
-            if system == "Linux":
-                return self._show_linux_picker(initial)
-            if system == "Windows":
-                return self._show_windows_picker(initial)
+            return picker(self, initial)
         except subprocess.TimeoutExpired:
             return None
         except Exception:
             return None
 
-        return None
-
     def _show_macos_picker(self, initial_dir: str | None) -> Path | None:
         """Show macOS folder picker using osascript."""
         safe_dir = initial_dir if initial_dir and '"' not in initial_dir else None
@@ -47,7 +66,8 @@ class SystemPlugin(Plugin):
 
         result = subprocess.run(  # nosec B603 B607
             ["osascript", "-e", script],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
             timeout=120,
         )
@@ -58,7 +78,8 @@ class SystemPlugin(Plugin):
 
     def _show_linux_picker(self, initial_dir: str | None) -> Path | None:
         """Show Linux folder picker using zenity or kdialog."""
-        if shutil.which("zenity"):
+        tool = _resolve_linux_picker()
+        if tool == "zenity":
             cmd = [
                 "zenity",
                 "--file-selection",
@@ -67,7 +88,7 @@ class SystemPlugin(Plugin):
             ]
             if initial_dir:
                 cmd.extend(["--filename", initial_dir + "/"])
-        elif shutil.which("kdialog"):
+        elif tool == "kdialog":
             cmd = [
                 "kdialog",
                 "--getexistingdirectory",
@@ -78,7 +99,9 @@ class SystemPlugin(Plugin):
         else:
             return None  # No dialog tool available
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)  # nosec B603
+        result = subprocess.run(  # nosec B603
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=120
+        )
 
         if result.returncode == 0:
             return Path(result.stdout.strip())
@@ -86,18 +109,11 @@ class SystemPlugin(Plugin):
 
     def _show_windows_picker(self, initial_dir: str | None) -> Path | None:
         """Show Windows folder picker using PowerShell."""
-        ps_script = """
-Add-Type -AssemblyName System.Windows.Forms
-$dialog = New-Object System.Windows.Forms.FolderBrowserDialog
-$dialog.Description = "Select Download Folder"
-$dialog.ShowNewFolderButton = $true
-if ($dialog.ShowDialog() -eq [System.Windows.Forms.DialogResult]::OK) {
-    Write-Output $dialog.SelectedPath
-}
-"""
+        # -NoProfile skips loading user profile scripts, which dominates startup.
         result = subprocess.run(  # nosec B603 B607
-            ["powershell", "-Command", ps_script],
-            capture_output=True,
+            ["powershell", "-NoProfile", "-Command", _WINDOWS_PICKER_PS1],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
             timeout=120,
         )
@@ -106,9 +122,19 @@ if ($dialog.ShowDialog() -eq [System.Windows.Forms.DialogResult]::OK) {
             return Path(result.stdout.strip())
         return None
 
+    _FOLDER_PICKERS: ClassVar[dict[str, Callable[..., Path | None]]] = {
+        "Darwin": _show_macos_picker,
+        "Linux": _show_linux_picker,
+        "Windows": _show_windows_picker,
+    }
+
     def reveal_in_file_manager(self, path: Path | str) -> bool:
         """Open file manager and select the specified file."""
-        path = Path(path).resolve()
+        path = Path(path)
+        # The API route hands over an already-resolved path; skip the realpath
+        # walk unless the path is relative or still has ".." segments.
+        if not path.is_absolute() or ".." in path.parts:
+            path = path.resolve()
 
         if not path.exists():
             return False
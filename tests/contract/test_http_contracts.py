@@ -49,12 +49,55 @@ def test_contract_frontend_dist_assets_are_served(
     _mount_static(app)
 
     with TestClient(app) as client:
-        assert client.get("/_astro/app.js").status_code == 200
+        astro_response = client.get("/_astro/app.js")
+        assert astro_response.status_code == 200
+        assert "immutable" in astro_response.headers["cache-control"]
         assert client.get("/manifest.json").status_code == 200
-        assert client.get("/locales/es.json").status_code == 200
-        assert client.get("/settings").text == "<html>Ryliox</html>"
+        locale_response = client.get("/locales/es.json")
+        assert locale_response.status_code == 200
+        assert "cache-control" not in locale_response.headers
+        page_response = client.get("/settings")
+        assert page_response.text == "<html>Ryliox</html>"
+        revalidated = client.get(
+            "/settings", headers={"If-None-Match": page_response.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert client.get("/..%2F..%2Fetc%2Fpasswd").text == "<html>Ryliox</html>"
 
         api_response = client.get("/api/missing")
 
     assert api_response.status_code == 404
     assert api_response.headers["content-type"].startswith("application/json")
+
+
+def test_contract_frontend_falls_back_when_dist_file_is_removed(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    dist = tmp_path / "frontend" / "dist"
+    dist.mkdir(parents=True)
+    (dist / "index.html").write_text("<html>Ryliox</html>", encoding="utf-8")
+    (dist / "manifest.json").write_text("{}", encoding="utf-8")
+    legacy = tmp_path / "web" / "static"
+    legacy.mkdir(parents=True)
+    (legacy / "index.html").write_text("<html>Legacy</html>", encoding="utf-8")
+
+    monkeypatch.setattr("web.server.config.REPO_ROOT", tmp_path)
+    app = FastAPI()
+    _mount_static(app)
+
+    with TestClient(app) as client:
+        (dist / "manifest.json").unlink()
+        page_response = client.get("/manifest.json")
+        (dist / "index.html").unlink()
+        legacy_response = client.get("/settings")
+        (legacy / "index.html").unlink()
+        running_response = client.get("/settings")
+
+    assert page_response.status_code == 200
+    assert page_response.text == "<html>Ryliox</html>"
+    assert legacy_response.status_code == 200
+    assert legacy_response.text == "<html>Legacy</html>"
+    assert running_response.status_code == 200
+    assert running_response.json() == {"name": "Ryliox", "status": "running"}
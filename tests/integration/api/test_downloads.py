@@ -11,12 +11,15 @@ Tests cover:
 
 from __future__ import annotations
 
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
     from fastapi.testclient import TestClient
 
 
@@ -292,6 +295,30 @@ class TestDownloadProgress:
         detail = data if "error" in data else data.get("detail", {})
         assert "Job not found" in detail.get("error", "")
 
+    @pytest.mark.parametrize(
+        ("current", "total", "expected"),
+        [
+            (3, 10, (3, 10)),
+            (0, 10, (None, 10)),
+            ("2", "bad", (2, None)),
+            (None, -1, (None, None)),
+        ],
+    )
+    def test_running_snapshot_normalizes_chapters_independently(self, current, total, expected):
+        """Each chapter field falls back to None on its own."""
+        from web.routes import downloads as downloads_routes
+
+        normalized = downloads_routes._normalize_progress_snapshot(
+            {
+                "job_id": "job-1",
+                "status": "running",
+                "current_chapter": current,
+                "total_chapters": total,
+            }
+        )
+
+        assert (normalized["current_chapter"], normalized["total_chapters"]) == expected
+
 
 @pytest.mark.integration
 class TestDownloadCancel:
@@ -423,6 +450,70 @@ class TestDownloadRateLimiting:
         assert all(r == 200 for r in responses), "GET /api/progress should not be rate limited"
 
 
+class _FakeClock:
+    """Monotonic clock driven by the test."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeProgressQueue:
+    """Minimal queue for progress_stream; each wait advances the fake clock."""
+
+    def __init__(
+        self,
+        clock: _FakeClock,
+        get_progress: Callable[[], dict | None],
+        *,
+        version: int = 0,
+        versions: Iterator[int] | None = None,
+        step: float | None = None,
+    ) -> None:
+        self._clock = clock
+        self._get_progress = get_progress
+        self._version = version
+        self._versions = versions
+        self._step = step
+
+    def get_progress_version(self) -> int:
+        return self._version
+
+    def get_progress(self, job_id=None):
+        return self._get_progress()
+
+    async def wait_for_progress_change_async(self, version: int, timeout: float) -> int:
+        self._clock.now += timeout if self._step is None else self._step
+        return version if self._versions is None else next(self._versions)
+
+
+@pytest.fixture
+def sse_stream(monkeypatch):
+    """progress_stream with a fake clock, a 1s max duration and a connected client."""
+    from web.routes import downloads as downloads_routes
+
+    clock = _FakeClock()
+    monkeypatch.setattr(downloads_routes.time, "monotonic", clock)
+    monkeypatch.setattr(downloads_routes, "SSE_MAX_DURATION_SECONDS", 1.0, raising=False)
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+
+    def make_queue(get_progress=lambda: None, **kwargs) -> _FakeProgressQueue:
+        return _FakeProgressQueue(clock, get_progress, **kwargs)
+
+    async def open_stream(queue: _FakeProgressQueue):
+        return await downloads_routes.progress_stream(
+            request=request,
+            job_id=None,
+            download_queue=queue,
+            request_id="test-request-id",
+        )
+
+    return SimpleNamespace(clock=clock, make_queue=make_queue, open=open_stream)
+
+
 @pytest.mark.integration
 class TestDownloadProgressStream:
     """Tests for GET /api/progress/stream SSE endpoint."""
@@ -447,47 +538,54 @@ class TestDownloadProgressStream:
         assert response.headers["cache-control"] == "no-cache"
 
     @pytest.mark.asyncio
-    async def test_progress_stream_uses_temporal_deadline(self, monkeypatch):
-        from web.routes import downloads as downloads_routes
+    async def test_progress_stream_uses_temporal_deadline(self, sse_stream):
+        response = await sse_stream.open(sse_stream.make_queue())
 
-        clock = 0.0
+        stream = response.body_iterator
+        assert (await anext(stream)).startswith(b"event: progress")
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+    @pytest.mark.asyncio
+    async def test_progress_stream_rebuilds_payload_only_on_version_change(self, sse_stream):
+        snapshots = [
+            None,
+            {"job_id": "j1", "status": "running"},
+            {"job_id": "j1", "status": "running"},
+        ]
+        queue = sse_stream.make_queue(
+            lambda: snapshots.pop(0), versions=iter([1, 1, 2, 2]), step=0.25
+        )
 
-        def fake_monotonic() -> float:
-            return clock
+        response = await sse_stream.open(queue)
 
-        class Queue:
-            def get_progress_version(self) -> int:
-                return 0
+        frames = [frame async for frame in response.body_iterator]
+        assert len(frames) == 2
+        assert b'"status":"idle"' in frames[0]
+        assert b'"status":"running"' in frames[1]
+        # One snapshot read per version bump (1 and 2), none for the timeout wakeup.
+        assert snapshots == []
 
-            def get_progress(self, job_id=None):
-                return None
+    @pytest.mark.asyncio
+    async def test_progress_stream_subscribers_share_rendered_frame(self, sse_stream):
+        reads = 0
 
-            async def wait_for_progress_change_async(self, version: int, timeout: float) -> int:
-                nonlocal clock
-                clock += timeout
-                return version
+        def get_progress():
+            nonlocal reads
+            reads += 1
+            return {"job_id": "j1", "status": "running"}
 
-        request = MagicMock()
-        request.is_disconnected = AsyncMock(return_value=False)
-        monkeypatch.setattr(downloads_routes.time, "monotonic", fake_monotonic)
-        monkeypatch.setattr(
-            downloads_routes,
-            "SSE_MAX_DURATION_SECONDS",
-            1.0,
-            raising=False,
-        )
+        queue = sse_stream.make_queue(get_progress, version=7)
 
-        response = await downloads_routes.progress_stream(
-            request=request,
-            job_id=None,
-            download_queue=Queue(),
-            request_id="test-request-id",
-        )
+        streams = []
+        for _ in range(3):
+            sse_stream.clock.now = 0.0
+            response = await sse_stream.open(queue)
+            streams.append([frame async for frame in response.body_iterator])
 
-        stream = response.body_iterator
-        assert (await anext(stream)).startswith("event: progress")
-        with pytest.raises(StopAsyncIteration):
-            await anext(stream)
+        assert reads == 1
+        assert streams[0] == streams[1] == streams[2]
+        assert streams[0][0] is streams[1][0]
 
     def test_progress_stream_cross_origin_blocked(self, test_client: TestClient):
         """Test that cross-origin SSE requests are blocked."""
@@ -223,6 +223,8 @@ class TestCORSSecurity:
 
             # Check CORS headers
             assert "access-control-allow-origin" in response.headers
+            # Browsers may cache the preflight instead of repeating it per call
+            assert response.headers.get("access-control-max-age") == "86400"
 
     def test_cors_disallowed_origins(self, base_url: str):
         """Test that disallowed origins are rejected."""
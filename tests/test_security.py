@@ -79,6 +79,27 @@ class TestSecurityMiddleware:
         assert response.status_code == 413
         assert response.json()["code"] == "request_too_large"
 
+    def test_cors_preflight_only_allows_configured_headers(self):
+        """Test that preflights list the fixed header allow-list."""
+        app = create_app()
+        preflight = {
+            "Origin": "http://localhost:8000",
+            "Access-Control-Request-Method": "POST",
+        }
+        with TestClient(app) as client:
+            allowed = client.options(
+                "/api/download",
+                headers={**preflight, "Access-Control-Request-Headers": "content-type"},
+            )
+            rejected = client.options(
+                "/api/download",
+                headers={**preflight, "Access-Control-Request-Headers": "x-unexpected"},
+            )
+
+        assert allowed.status_code == 200
+        assert "content-type" in allowed.headers["access-control-allow-headers"].lower()
+        assert rejected.status_code == 400
+
 
 class TestDependencyInjection:
     """Test cases for dependency providers."""
@@ -38,6 +38,15 @@ async def test_http_client_uses_async_context_manager():
         assert client._owns_client is True
 
 
+@pytest.mark.asyncio
+async def test_http_client_falls_back_to_http1_without_h2(monkeypatch):
+    monkeypatch.setattr("core.http_client.importlib.util.find_spec", lambda _name: None)
+
+    assert HttpClient._http2_enabled() is False
+    async with HttpClient(cookies_file=config.COOKIES_FILE) as client:
+        assert client.client is not None
+
+
 @pytest.mark.asyncio
 async def test_http_client_not_initialized_outside_context():
     """Test that HTTP client raises error when accessed outside context manager."""
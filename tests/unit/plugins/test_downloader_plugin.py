@@ -183,3 +183,55 @@ async def test_download_passes_detected_cover_filename_to_epub(tmp_path):
     )
 
     assert epub_plugin.cover_image == "cover.jpg"
+
+
+class DummyMultiChapterPlugin:
+    def __init__(self, count: int) -> None:
+        self.chapters = [
+            {
+                "filename": f"ch{n}.html",
+                "content_url": f"https://learning.oreilly.com/library/view/demo/ch{n}.html",
+                "title": f"Chapter {n}",
+                "stylesheets": [],
+                "images": [],
+            }
+            for n in range(count)
+        ]
+
+    async def fetch_list(self, _book_id: str) -> list[dict[str, object]]:
+        return self.chapters
+
+    async def fetch_toc(self, _book_id: str) -> list[dict[str, str]]:
+        return []
+
+    async def fetch_content(self, content_url: str) -> str:
+        return f"<p>{content_url.rsplit('/', 1)[-1]}</p>"
+
+
+class DummyPassThroughHtmlProcessorPlugin(DummyHtmlProcessorPlugin):
+    def process(self, html: str, _book_id: str, **_kwargs) -> tuple[str, list[str]]:
+        return html, []
+
+    def wrap_xhtml(self, content: str, _css_files: list[str], _title: str = "") -> str:
+        return content
+
+
+@pytest.mark.asyncio
+async def test_download_processes_prefetched_chapters_in_order(tmp_path):
+    plugin = DownloaderPlugin(
+        book_plugin=DummyBookPlugin(),
+        chapters_plugin=DummyMultiChapterPlugin(3),
+        assets_plugin=DummyAssetsWithDetectedCoverPlugin(),
+        html_processor_plugin=DummyPassThroughHtmlProcessorPlugin(),
+        output_plugin=DummySuccessfulOutputPlugin(),
+        epub_plugin=DummyEpubPlugin(),
+    )
+
+    result = await plugin.download(
+        book_id="demo-book", output_dir=tmp_path, formats=["epub"], skip_images=True
+    )
+
+    oebps = tmp_path / "demo-book" / "OEBPS"
+    assert result.chapters_count == 3
+    for n in range(3):
+        assert (oebps / f"ch{n}.xhtml").read_text(encoding="utf-8") == f"<p>ch{n}.html</p>"
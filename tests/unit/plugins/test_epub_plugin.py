@@ -34,12 +34,12 @@ def test_create_epub_zip_excludes_non_epub_artifacts(tmp_path: Path):
     assert "OEBPS/stale.pdf" not in names
 
 
-def test_write_content_opf_escapes_text_once(tmp_path: Path):
+def test_render_content_opf_escapes_text_once(tmp_path: Path):
     plugin = EpubPlugin()
     oebps = tmp_path / "OEBPS"
     oebps.mkdir()
 
-    plugin._write_content_opf(
+    content = plugin._render_content_opf(
         oebps=oebps,
         book_info={
             "title": "A & B",
@@ -54,8 +54,6 @@ def test_write_content_opf_escapes_text_once(tmp_path: Path):
         cover_image=None,
     )
 
-    content = (oebps / "content.opf").read_text(encoding="utf-8")
-
     assert "<dc:title>A &amp; B</dc:title>" in content
     assert "<dc:creator>X &amp; Y</dc:creator>" in content
     assert "&amp;amp;" not in content
@@ -75,3 +73,71 @@ def test_validate_manifest_files_rejects_missing_chapter(tmp_path: Path):
                 {"filename": "chapter02.html"},
             ],
         )
+
+
+def test_generate_streams_package_documents_without_touching_build_tree(tmp_path: Path):
+    plugin = EpubPlugin()
+    oebps = tmp_path / "OEBPS"
+    oebps.mkdir()
+    chapter_source = '<html><body><a href="#intro">Intro</a><p id="intro" /></body></html>'
+    (oebps / "chapter.xhtml").write_text(chapter_source, encoding="utf-8")
+
+    epub_path = plugin.generate(
+        book_info={"id": "demo", "title": "Demo"},
+        chapters=[{"filename": "chapter.html"}],
+        toc=[{"title": "Intro", "reference_id": "urn:orm:book:demo/-/chapter.html"}],
+        output_dir=tmp_path,
+        css_files=[],
+    )
+
+    with zipfile.ZipFile(epub_path) as zf:
+        names = zf.namelist()
+        chapter = zf.read("OEBPS/chapter.xhtml").decode("utf-8")
+        mimetype = zf.getinfo("mimetype")
+        mimetype_data = zf.read("mimetype")
+
+    assert names[0] == "mimetype"
+    assert mimetype.compress_type == zipfile.ZIP_STORED
+    assert mimetype_data == b"application/epub+zip"
+    assert not (tmp_path / "mimetype").exists()
+    assert {"META-INF/container.xml", "OEBPS/content.opf", "OEBPS/toc.ncx"} <= set(names)
+    assert names.count("OEBPS/nav.xhtml") == 1
+    assert 'href="chapter.xhtml#intro"' in chapter
+    assert (oebps / "chapter.xhtml").read_text(encoding="utf-8") == chapter_source
+    assert not (oebps / "nav.xhtml").exists()
+    assert not (tmp_path / "META-INF").exists()
+
+
+def test_normalize_toc_items_keeps_ncx_ids_unique():
+    plugin = EpubPlugin()
+
+    entries = plugin._normalize_toc_items(
+        [
+            {"title": "One", "fragment": "intro"},
+            {"title": "Two", "fragment": "intro", "children": [{"title": "Three"}]},
+            {"title": "Four"},
+            {"title": "Five", "fragment": "intro_2"},
+        ]
+    )
+
+    ids = [entries[0].nav_id, entries[1].nav_id, entries[1].children[0].nav_id]
+    ids += [entries[2].nav_id, entries[3].nav_id]
+    assert ids == ["intro", "intro_2", "_id", "_id_2", "intro_2_2"]
+
+
+def test_resolve_internal_links_reads_many_chapters_in_order(tmp_path: Path):
+    plugin = EpubPlugin()
+    oebps = tmp_path / "OEBPS"
+    oebps.mkdir()
+    for i in range(8):
+        target = (i + 1) % 8
+        (oebps / f"ch{i}.xhtml").write_text(
+            f'<p id="p{i}"><a href="#p{target}">next</a></p>', encoding="utf-8"
+        )
+
+    documents = plugin._resolve_internal_links(oebps)
+
+    assert sorted(documents) == [f"ch{i}.xhtml" for i in range(8)]
+    for i in range(8):
+        target = (i + 1) % 8
+        assert f'href="ch{target}.xhtml#p{target}"' in documents[f"ch{i}.xhtml"]
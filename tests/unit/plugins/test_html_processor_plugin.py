@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from lxml import html as lxml_html
 
 from plugins.html_processor import HtmlProcessorPlugin
 
@@ -21,6 +22,16 @@ def test_image_filename_from_url_generates_stable_safe_name():
     assert filename.startswith("My_Cover_Image-")
 
 
+def test_image_filename_from_url_ignores_params_query_and_fragment():
+    plugin = HtmlProcessorPlugin()
+
+    assert plugin.image_filename_from_url("https://cdn.example.com/a/fig_1.PNG;v=2?s=l#x") == (
+        "fig_1-.png"
+    )
+    assert plugin.image_filename_from_url("https://cdn.example.com/a/?f=b.png") is None
+    assert plugin.image_filename_from_url("https://cdn.example.com") is None
+
+
 def test_wrap_xhtml_escapes_title_and_includes_stylesheets():
     plugin = HtmlProcessorPlugin()
 
@@ -53,6 +64,17 @@ def test_rewrite_srcset_value_rewrites_each_candidate():
     ]
 
 
+def test_rewrite_srcset_value_keeps_repeated_candidates():
+    plugin = HtmlProcessorPlugin()
+
+    rewritten, originals = plugin._rewrite_srcset_value(
+        "icon.png 1x, icon.png 2x, icon.png", base_url="https://example.com/book/"
+    )
+
+    assert rewritten == "Images/icon-.png 1x, Images/icon-.png 2x, Images/icon-.png"
+    assert originals == ["https://example.com/book/icon.png"] * 3
+
+
 def test_rewrite_image_value_downloads_all_images_for_offline_epub():
     plugin = HtmlProcessorPlugin()
 
@@ -78,3 +100,96 @@ def test_rewrite_href_rewrites_chapter_paths_to_local_xhtml():
 
     # Chapter hrefs are converted to local .xhtml references for EPUB navigation
     assert href == "ch1.xhtml"
+
+
+def test_process_rewrites_content_div_and_keeps_xhtml_friendly_markup():
+    plugin = HtmlProcessorPlugin()
+
+    html = (
+        '<html><body><div id="sbo-rt-content"><section epub:type="chapter ibooks:x">'
+        '<a id="top"></a><img src="https://example.com/a/fig.png">'
+        '<a href="https://learning.oreilly.com/library/view/demo/9781098181642/ch2.html#Ünï">next</a>'
+        '<style data-template="a > b { color: red; }"></style>'
+        "</section></div><p>outside</p></body></html>"
+    )
+
+    content, images = plugin.process(html, "9781098181642", path_prefix="../")
+
+    assert images == ["https://example.com/a/fig.png"]
+    assert content.startswith('<div id="sbo-rt-content">')
+    assert "outside" not in content
+    assert 'epub:type="chapter"' in content
+    assert '<a id="top"></a>' in content
+    assert '<img src="../Images/fig.png"/>' in content
+    assert 'href="ch2.xhtml#Ünï"' in content
+    assert "<style><![CDATA[a > b { color: red; }]]></style>" in content
+
+
+def test_process_handles_empty_document():
+    plugin = HtmlProcessorPlugin()
+
+    assert plugin.process("", "book") == ("", [])
+
+
+def test_process_skip_images_drops_converted_svg_images_and_keeps_parents_open():
+    plugin = HtmlProcessorPlugin()
+
+    html = (
+        '<div id="sbo-rt-content"><figure><img src="a.png"></figure>'
+        '<p><svg width="3"><image href="z.png"/></svg>text</p></div>'
+    )
+
+    content, images = plugin.process(html, "book", skip_images=True)
+
+    assert images == []
+    assert content == '<div id="sbo-rt-content"><figure></figure><p>text</p></div>'
+
+
+def test_detect_cover_image_prefers_cover_img_over_cover_container():
+    plugin = HtmlProcessorPlugin()
+    both = lxml_html.document_fromstring(
+        '<div class="Book-Cover"><img src="inner.png"></div><img alt="COVER art" src="cover.png">'
+    )
+    container_only = lxml_html.document_fromstring('<div id="cover"><p><img src="a.png"></p></div>')
+    neither = lxml_html.document_fromstring('<img src="a.png">')
+
+    assert plugin.detect_cover_image(both) == "cover.png"
+    assert plugin.detect_cover_image(container_only) == "a.png"
+    assert plugin.detect_cover_image(neither) is None
+
+
+def test_process_ignores_content_div_markup_inside_comments_and_scripts():
+    plugin = HtmlProcessorPlugin()
+    html = (
+        "<html><head><script>var s = '<div id=\"sbo-rt-content\">fake</div>';</script></head>"
+        '<body><nav><a href="toc.html">toc</a></nav><!-- <div id="sbo-rt-content">old</div> -->'
+        '<div id="sbo-rt-content"><p>real</p></div></body></html>'
+    )
+
+    content, _images = plugin.process(html, "book")
+
+    assert content == '<div id="sbo-rt-content"><p>real</p></div>'
+
+
+def test_process_returns_escaped_text_for_content_without_elements():
+    plugin = HtmlProcessorPlugin()
+
+    content, images = plugin.process('<div id="sbo-rt-content">Q &amp; A &lt;br&gt;</div>', "book")
+
+    assert images == []
+    assert content == '<div id="sbo-rt-content">Q &amp; A &lt;br&gt;</div>'
+
+
+def test_process_moves_content_out_of_html5_void_tags():
+    plugin = HtmlProcessorPlugin()
+    html = (
+        '<div id="sbo-rt-content"><video><source src="a.mp4"><track src="t.vtt">'
+        "Fallback <b>text</b></video><p>a<wbr>b</p></div>"
+    )
+
+    content, _images = plugin.process(html, "book")
+
+    assert content == (
+        '<div id="sbo-rt-content"><video><source src="a.mp4"/><track src="t.vtt"/>'
+        "Fallback <b>text</b></video><p>a<wbr/>b</p></div>"
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import TYPE_CHECKING
 
 import pytest
@@ -71,3 +72,27 @@ def test_create_book_dir_uses_unique_suffix_for_collisions(tmp_path: Path):
     assert first != second
     assert first.name == "repeated-title"
     assert second.name == "repeated-title-2"
+
+
+def test_create_book_dir_reuses_suffixed_directory_for_same_book(tmp_path: Path):
+    plugin = OutputPlugin(authorized_root=tmp_path)
+
+    plugin.create_book_dir(output_dir=tmp_path, book_id="book-1", title="Repeated Title")
+    second = plugin.create_book_dir(output_dir=tmp_path, book_id="book-2", title="Repeated Title")
+    third = plugin.create_book_dir(output_dir=tmp_path, book_id="book-3", title="Repeated Title")
+    again = plugin.create_book_dir(output_dir=tmp_path, book_id="book-2", title="Repeated Title")
+
+    assert third.name == "repeated-title-3"
+    assert again == second
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows uses the write probe")
+def test_validate_dir_rejects_unwritable_directory(tmp_path: Path, monkeypatch):
+    plugin = OutputPlugin(authorized_root=tmp_path)
+    monkeypatch.setattr("plugins.output.os.access", lambda *_args: False)
+
+    valid, message, resolved = plugin.validate_dir(tmp_path)
+
+    assert valid is False
+    assert message == "Directory is not writable"
+    assert resolved is None
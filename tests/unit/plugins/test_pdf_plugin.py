@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+
+import pytest
+
+from plugins import pdf as pdf_module
+from plugins.pdf import PdfPlugin
+
+pytestmark = pytest.mark.unit
+
+_RENDERER_ARGS = ("/book/OEBPS", "/book", ("", ""))
+
+
+@pytest.fixture
+def rendered(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str]]:
+    """Record chapter renders instead of running WeasyPrint."""
+    calls: list[tuple[str, str]] = []
+    monkeypatch.setattr(PdfPlugin, "_weasyprint", object())
+    monkeypatch.setattr(pdf_module, "_build_chapter_renderer", lambda *_args: _RENDERER_ARGS)
+    monkeypatch.setattr(
+        pdf_module, "_render_chapter_pdf_with", lambda _renderer, job: calls.append(job)
+    )
+    monkeypatch.setattr(pdf_module, "_render_chapter_pdf", calls.append)
+    return calls
+
+
+def test_render_chapter_pdfs_stops_starting_chapters_once_cancelled(rendered):
+    jobs = [("<html />", "one.pdf"), ("<html />", "two.pdf")]
+
+    PdfPlugin()._render_chapter_pdfs(jobs, _RENDERER_ARGS, cancel_check=lambda: bool(rendered))
+
+    assert rendered == [jobs[0]]
+
+
+def test_render_chapter_pdfs_serial_path_leaves_worker_renderer_alone(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    renderers: list[object] = []
+    sentinel = object()
+    monkeypatch.setattr(PdfPlugin, "_weasyprint", object())
+    monkeypatch.setattr(pdf_module, "_chapter_renderer", sentinel)
+    monkeypatch.setattr(pdf_module, "_build_chapter_renderer", lambda *args: args)
+    monkeypatch.setattr(
+        pdf_module, "_render_chapter_pdf_with", lambda renderer, _job: renderers.append(renderer)
+    )
+
+    PdfPlugin()._render_chapter_pdfs([("<html />", "one.pdf")], _RENDERER_ARGS)
+
+    assert renderers == [_RENDERER_ARGS]
+    assert pdf_module._chapter_renderer is sentinel
+
+
+def test_render_chapter_pdfs_caps_worker_processes(monkeypatch: pytest.MonkeyPatch, rendered):
+    pools: list[int] = []
+
+    class InlineExecutor:
+        def __init__(self, *, max_workers: int, **_kwargs: object) -> None:
+            pools.append(max_workers)
+
+        def submit(self, fn, job):
+            future: Future[None] = Future()
+            future.set_result(fn(job))
+            return future
+
+        def shutdown(self, *, wait: bool, cancel_futures: bool) -> None:
+            return None
+
+    monkeypatch.setattr(pdf_module, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(pdf_module.os, "cpu_count", lambda: 64)
+    jobs = [("<html />", f"{index}.pdf") for index in range(10)]
+
+    PdfPlugin()._render_chapter_pdfs(jobs, _RENDERER_ARGS)
+
+    assert pools == [pdf_module._MAX_RENDER_WORKERS]
+    assert sorted(rendered) == sorted(jobs)
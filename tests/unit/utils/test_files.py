@@ -43,6 +43,10 @@ class TestRemoveAccents:
         assert remove_accents("hello") == "hello"
         assert remove_accents("TEST123") == "TEST123"
 
+    def test_characters_outside_latin_ranges(self):
+        """Test compatibility forms beyond Latin still decompose alongside accents."""
+        assert remove_accents("\uff23af\u00e9 \u2460") == "Cafe 1"
+
 
 class TestSanitizeFilename:
     """Test suite for sanitize_filename function."""
@@ -53,6 +57,12 @@ class TestSanitizeFilename:
         assert sanitize_filename("file|name.txt") == "file-name.txt"
         assert sanitize_filename('file"name.txt') == "file'name.txt"
 
+    def test_safe_ascii_name_is_returned_unchanged(self):
+        """Test already-safe names pass through, while near-misses are still cleaned."""
+        assert sanitize_filename("Chapter 1 - Intro.xhtml") == "Chapter 1 - Intro.xhtml"
+        assert sanitize_filename("Chapter  1.") == "Chapter 1"
+        assert sanitize_filename("~notes..txt") == "notes-txt"
+
     def test_path_traversal_protection(self):
         """Test protection against path traversal attacks."""
         # Path traversal characters are replaced with '-' not removed
@@ -98,3 +98,18 @@ def test_require_same_origin_accepts_forwarded_headers_from_proxy():
     )
 
     guard(request)
+
+
+def test_require_same_origin_blocks_origin_when_forwarded_port_differs():
+    guard = require_same_origin("save_cookies")
+    request = _build_request(
+        {
+            "host": "app.example.com",
+            "origin": "http://app.example.com",
+            "x-forwarded-port": "8080",
+        },
+        method="POST",
+    )
+
+    with pytest.raises(ForbiddenOriginError):
+        guard(request)
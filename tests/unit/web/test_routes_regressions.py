@@ -217,3 +217,56 @@ def test_progress_error_does_not_expose_internal_trace_path():
 
     assert "trace_log" not in payload
     assert payload["details"] == {"reason": "render failed"}
+
+
+def test_run_server_falls_back_to_stdlib_loop_without_uvloop(monkeypatch: pytest.MonkeyPatch):
+    from web import server
+
+    calls: dict = {}
+    monkeypatch.setattr(
+        server.importlib.util, "find_spec", lambda name: None if name == "uvloop" else object()
+    )
+    monkeypatch.setattr(server, "configure_logging", lambda **_: None)
+    monkeypatch.setattr(server.uvicorn, "run", lambda *args, **kwargs: calls.update(kwargs))
+
+    server.run_server(host="127.0.0.1", port=8123)
+
+    assert calls["loop"] == "asyncio"
+    assert calls["http"] == "httptools"
+
+
+def test_run_server_passes_server_settings_to_uvicorn(monkeypatch: pytest.MonkeyPatch):
+    from web import server
+
+    calls: dict = {}
+    monkeypatch.setattr(server, "configure_logging", lambda **_: None)
+    monkeypatch.setattr(server.uvicorn, "run", lambda *args, **kwargs: calls.update(kwargs))
+    monkeypatch.setattr(server.config.SETTINGS.server, "timeout_keep_alive", 30)
+    monkeypatch.setattr(server.config.SETTINGS.server, "backlog", 512)
+
+    server.run_server()
+
+    assert calls["timeout_keep_alive"] == 30
+    assert calls["backlog"] == 512
+
+
+def test_security_headers_middleware_keeps_headers_set_by_the_route():
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    from web.server import SecurityHeadersMiddleware
+
+    def framed(_request):
+        return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    app = Starlette(routes=[Route("/", framed)])
+    app.add_middleware(
+        SecurityHeadersMiddleware,
+        headers=[("X-Frame-Options", "DENY"), ("X-Content-Type-Options", "nosniff")],
+    )
+
+    response = TestClient(app).get("/")
+
+    assert response.headers.get_list("x-frame-options") == ["SAMEORIGIN"]
+    assert response.headers["x-content-type-options"] == "nosniff"
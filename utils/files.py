@@ -18,27 +18,49 @@ _WINDOWS_RESERVED: Final[frozenset[str]] = frozenset(
     }
 )
 
-_INVALID_FILENAME_CHARS: Final[re.Pattern[str]] = re.compile(r'[<>:"/\\|\x00-\x1f]')
-_REMOVE_FILENAME_CHARS: Final[re.Pattern[str]] = re.compile(r"[?*]")
+# One translate pass: quotes become apostrophes, ``?``/``*`` are dropped and
+# OS-reserved characters become ``-``.
+_FILENAME_CHAR_MAP: Final[dict[int, str | None]] = str.maketrans(
+    {'"': "'", "?": None, "*": None, **dict.fromkeys("<>:/\\|", "-")}
+)
+
+# Anything sanitize_filename would rewrite in a printable ASCII name.
+_UNSAFE_FILENAME_CHARS: Final[re.Pattern[str]] = re.compile(r'[<>:"/\\|?*]|\.\.|  ')
 _WHITESPACE_RUN: Final[re.Pattern[str]] = re.compile(r"\s+")
 _NON_SLUG: Final[re.Pattern[str]] = re.compile(r"[^a-z0-9]+")
-_LEADING_DASH: Final[re.Pattern[str]] = re.compile(r"^-+")
-_TRAILING_DASH: Final[re.Pattern[str]] = re.compile(r"-+$")
 _LEADING_PATH_PREFIX: Final[re.Pattern[str]] = re.compile(r"^[\\/]+")
 
 MAX_FILENAME_LENGTH: Final[int] = 200
 MAX_SLUG_LENGTH: Final[int] = 100
 
 
+def _strip_marks(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+# Latin-1 and Latin Extended-A/B cover the accents seen in book titles;
+# anything outside the table still goes through full NFKD decomposition.
+_ACCENT_TABLE: Final[dict[int, str]] = {
+    code: _strip_marks(chr(code)) for code in range(0x80, 0x250)
+}
+
+
 def remove_accents(text: str) -> str:
     """Strip diacritics from ``text`` using NFKD decomposition."""
     if not text:
         return ""
-    decomposed = unicodedata.normalize("NFKD", text)
-    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    if text.isascii():
+        return text
+    text = text.translate(_ACCENT_TABLE)
+    if text.isascii():
+        return text
+    return _strip_marks(text)
 
 
 def _strip_control_chars(name: str) -> str:
+    if name.isprintable():
+        return name
     return "".join(ch for ch in name if ch.isprintable() and ch not in "\r\n\t")
 
 
@@ -54,14 +76,24 @@ def sanitize_filename(name: str | None) -> str:
     if name is None:
         return "unnamed_file"
 
-    cleaned = _strip_control_chars(str(name))
-    cleaned = cleaned.replace("\r", " ").replace("\n", " ").replace("\t", " ")
+    name = str(name)
+    # Fast path: most chapter and book titles are already safe as-is.
+    if (
+        0 < len(name) <= MAX_FILENAME_LENGTH
+        and name.isascii()
+        and name.isprintable()
+        and name[0] not in "~$. "
+        and name[-1] not in ". "
+        and not _UNSAFE_FILENAME_CHARS.search(name)
+        and name.partition(".")[0].upper() not in _WINDOWS_RESERVED
+    ):
+        return name
+
+    cleaned = _strip_control_chars(name)
     cleaned = _LEADING_PATH_PREFIX.sub("", cleaned)
     cleaned = cleaned.lstrip("~").lstrip("$")
     cleaned = cleaned.replace("..", "-")
-    cleaned = cleaned.replace('"', "'")
-    cleaned = _REMOVE_FILENAME_CHARS.sub("", cleaned)
-    cleaned = _INVALID_FILENAME_CHARS.sub("-", cleaned)
+    cleaned = cleaned.translate(_FILENAME_CHAR_MAP)
     cleaned = _WHITESPACE_RUN.sub(" ", cleaned).strip().strip(".")
     cleaned = cleaned.strip()
 
@@ -84,11 +116,8 @@ def slugify(name: str | None) -> str:
     if not name:
         return "unnamed-folder"
 
-    slug = remove_accents(str(name)).lower()
-    slug = slug.replace("\r", " ").replace("\n", " ").replace("\t", " ")
-    slug = _NON_SLUG.sub("-", slug)
-    slug = _LEADING_DASH.sub("", slug)
-    slug = _TRAILING_DASH.sub("", slug)
+    # _NON_SLUG already folds whitespace and control characters into dashes.
+    slug = _NON_SLUG.sub("-", remove_accents(str(name)).lower()).strip("-")
 
     if not slug:
         return "unnamed-folder"
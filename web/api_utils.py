@@ -11,6 +11,30 @@ from fastapi.responses import JSONResponse
 
 from web.schemas import ErrorResponse
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_compact(payload: dict[str, Any]) -> bytes:
+    """Compact UTF-8 JSON bytes, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass  # e.g. non-str keys; let stdlib json decide
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class _CompactJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered through :func:`_dumps_compact`."""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps_compact(content)
+
 
 class ErrorCode(StrEnum):
     """Stable error codes exposed by the API."""
@@ -59,7 +83,7 @@ def error_response(
     payload = ErrorResponse(error=message, code=str(code), details=details).model_dump(
         exclude_none=True
     )
-    return JSONResponse(content=payload, status_code=status_code)
+    return _CompactJSONResponse(content=payload, status_code=status_code)
 
 
 def not_found_response(message: str, code: ErrorCode | str = ErrorCode.NOT_FOUND) -> JSONResponse:
@@ -81,9 +105,12 @@ def internal_error_response(message: str = "Internal server error.") -> JSONResp
     )
 
 
-def sse_event(event: str, payload: dict[str, Any]) -> str:
+def sse_event(event: str, payload: dict[str, Any]) -> bytes:
     """Serializa un frame Server-Sent Event con payload JSON compacto.
 
+    Devuelve ``bytes`` UTF-8 para que ``StreamingResponse`` no recodifique
+    cada frame.
+
     Args:
         event:   Nombre del evento. No puede contener ``\\n`` ni ``\\r``.
         payload: Datos serializables a JSON.
@@ -97,20 +124,20 @@ def sse_event(event: str, payload: dict[str, Any]) -> str:
             f"sse_event: el nombre de evento no puede contener saltos de línea: {event!r}"
         )
     try:
-        data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        data = _dumps_compact(payload)
     except (TypeError, ValueError) as exc:
         raise TypeError(
             f"sse_event: payload para evento {event!r} no es JSON-serializable: {exc}"
         ) from exc
-    return f"event: {event}\ndata: {data}\n\n"
+    return b"event: %b\ndata: %b\n\n" % (event.encode("utf-8"), data)
 
 
-def sse_comment(text: str = "") -> str:
+def sse_comment(text: str = "") -> bytes:
     """Emite un comentario SSE, útil como keepalive/heartbeat.
 
     Example::
 
-        yield sse_comment("keepalive")  # →  ': keepalive\\n\\n'
+        yield sse_comment("keepalive")  # →  b': keepalive\\n\\n'
     """
     safe = text.replace("\n", " ").replace("\r", " ")
-    return f": {safe}\n\n"
+    return f": {safe}\n\n".encode()
@@ -9,8 +9,13 @@ Implements:
 from __future__ import annotations
 
 import asyncio
+import hmac
 import ipaddress
 import logging
+import re
+import secrets
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
@@ -19,6 +24,13 @@ from fastapi.exceptions import RequestValidationError
 
 import config
 from core import create_default_kernel
+from core.cache import (
+    get_book_metadata_cache,
+    get_chapter_list_cache,
+    get_search_results_cache,
+    start_all_cleanup_tasks,
+    stop_all_cleanup_tasks,
+)
 
 # New architectural imports (Dependency Inversion)
 from core.repository import DownloadJobRepository
@@ -47,6 +59,8 @@ DOWNLOAD_QUEUE_DB = config.DATA_DIR / "download_jobs.sqlite3"
 DOWNLOAD_ERROR_LOG_DIR = config.DATA_DIR / "logs"
 QUEUE_POLL_INTERVAL_SECONDS: float = 0.5
 _SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
+# Host headers simple enough that a byte-for-byte Origin match proves same-origin.
+_PLAIN_HOST_RE = re.compile(r"[A-Za-z0-9.-]+(?::[1-9][0-9]{0,3})?")
 
 
 class ForbiddenOriginError(Exception):
@@ -94,13 +108,6 @@ async def initialize_app_services(
     repository: IDownloadJobRepository | None = None,
 ) -> None:
     """Initialize all application-scoped services during startup."""
-    from core.cache import (
-        get_book_metadata_cache,
-        get_chapter_list_cache,
-        get_search_results_cache,
-        start_all_cleanup_tasks,
-    )
-
     await get_book_metadata_cache().clear()
     await get_chapter_list_cache().clear()
     await get_search_results_cache().clear()
@@ -118,8 +125,6 @@ async def initialize_app_services(
 
 async def shutdown_app_services(app: FastAPI) -> None:
     """Stop services in a safe order during shutdown."""
-    from core.cache import stop_all_cleanup_tasks
-
     await stop_all_cleanup_tasks()
     download_queue: DownloadQueueService | None = getattr(app.state, "download_queue", None)
     if download_queue is not None:
@@ -273,6 +278,28 @@ def _is_same_origin(request: Request) -> bool:
     if not origin:
         return request.method.upper() in _SAFE_METHODS
 
+    request_host_header = (
+        _first_forwarded_value(request.headers.get("x-forwarded-host"))
+        or request.headers.get("host", "").strip()
+    )
+    request_scheme = (
+        _first_forwarded_value(request.headers.get("x-forwarded-proto"))
+        or request.url.scheme.lower()
+    )
+    request_scheme = request_scheme.lower()
+
+    # Fast path: Origin is exactly "<scheme>://<host>" for a plain host with at
+    # most a 4-digit port, so no URL parsing is needed. A forwarded port could
+    # differ from the one implied by the host, so those requests take the
+    # full check.
+    if (
+        request_scheme in ("http", "https")
+        and "x-forwarded-port" not in request.headers
+        and _PLAIN_HOST_RE.fullmatch(request_host_header)
+        and origin.lower() == f"{request_scheme}://{request_host_header.lower()}"
+    ):
+        return True
+
     try:
         parsed_origin = urlparse(origin)
     except ValueError:
@@ -290,16 +317,6 @@ def _is_same_origin(request: Request) -> bool:
         logger.warning("Blocked Origin header with invalid port: %r", origin)
         return False
 
-    request_host_header = (
-        _first_forwarded_value(request.headers.get("x-forwarded-host"))
-        or request.headers.get("host", "").strip()
-    )
-    request_scheme = (
-        _first_forwarded_value(request.headers.get("x-forwarded-proto"))
-        or request.url.scheme.lower()
-    )
-    request_scheme = request_scheme.lower()
-
     if not request_host_header or not request_scheme:
         return False
 
@@ -400,8 +417,6 @@ def validate_path_dependency(
         HTTPException: If validation fails
     """
     try:
-        from pathlib import Path
-
         base = Path(base_dir) if base_dir else None
         validated = validate_file_path(path, base, must_exist)
         return str(validated)
@@ -535,9 +550,6 @@ class CSRFProtection:
 
     async def generate_token(self, session_id: str) -> str:
         """Generate a new CSRF token for a session."""
-        import secrets
-        import time
-
         token = secrets.token_urlsafe(self._token_length)
         expires = time.time() + self._ttl
 
@@ -548,8 +560,6 @@ class CSRFProtection:
 
     async def validate_token(self, session_id: str, provided_token: str) -> bool:
         """Validate a CSRF token."""
-        import time
-
         async with self._lock:
             if session_id not in self._tokens:
                 return False
@@ -562,8 +572,6 @@ class CSRFProtection:
                 return False
 
             # Constant-time comparison
-            import hmac
-
             is_valid = hmac.compare_digest(stored_token, provided_token)
 
             # Rotate token after use (one-time use pattern)
@@ -574,8 +582,6 @@ class CSRFProtection:
 
     async def cleanup_expired(self) -> int:
         """Clean up expired tokens. Returns count removed."""
-        import time
-
         async with self._lock:
             now = time.time()
             expired = [sid for sid, (_, expires) in self._tokens.items() if now > expires]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -167,25 +168,31 @@ async def book_chapters(
             },
         ) from exc
 
+    # Every field is cast and range-checked here, so the models are built with
+    # model_construct instead of paying for a second validation per chapter.
+    construct = ChapterSummaryResponse.model_construct
     try:
         chapters = []
         for idx, chapter in enumerate(raw_chapters):
-            raw_index = chapter.get("index", idx)
-            raw_pages = chapter.get("virtual_pages")
-            raw_minutes = chapter.get("minutes_required")
+            get = chapter.get
+            raw_pages = get("virtual_pages")
+            raw_minutes = get("minutes_required")
 
             pages = int(raw_pages) if raw_pages is not None else None
             if pages is not None and pages <= 0:
                 pages = None
 
             minutes = float(raw_minutes) if raw_minutes is not None else None
-            if minutes is not None and minutes < 0:
-                minutes = None
+            if minutes is not None:
+                if math.isnan(minutes):
+                    raise ValueError("minutes_required is NaN")
+                if minutes < 0:
+                    minutes = None
 
             chapters.append(
-                ChapterSummaryResponse(
-                    index=int(raw_index),
-                    title=str(chapter.get("title") or f"Chapter {idx + 1}"),
+                construct(
+                    index=int(get("index", idx)),
+                    title=str(get("title") or f"Chapter {idx + 1}"),
                     pages=pages,
                     minutes=minutes,
                 )
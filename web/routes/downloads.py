@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
+import weakref
 from typing import TYPE_CHECKING, Any
 
 from fastapi import (
@@ -19,7 +19,6 @@ from fastapi import (
     status,
 )
 from fastapi.responses import StreamingResponse
-from pydantic import TypeAdapter
 
 from core.services import QueueCapacityError
 from plugins.downloader import DownloaderPlugin
@@ -31,18 +30,25 @@ from web.dependencies import (
     require_same_origin,
 )
 from web.schemas import (
+    CancelledProgress,
     CancelRequest,
     CancelResponse,
+    CompletedProgress,
     DownloadRequest,
     DownloadStartResponse,
+    ErrorProgress,
+    IdleProgress,
     ProgressResponse,
+    QueuedProgress,
+    RunningProgress,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Callable
     from pathlib import Path
 
     from fastapi.responses import JSONResponse
+    from pydantic import BaseModel
 
     from core.kernel import Kernel
     from core.services import DownloadQueueService
@@ -52,11 +58,27 @@ router = APIRouter(prefix="/api", tags=["downloads"])
 
 SSE_HEARTBEAT_INTERVAL_SECONDS: float = 15.0
 SSE_MAX_DURATION_SECONDS: float = 3_600.0
-_PROGRESS_ADAPTER: TypeAdapter[ProgressResponse] = TypeAdapter(ProgressResponse)
+_HEARTBEAT_FRAME: bytes = sse_comment("heartbeat")
+# _normalize_progress_snapshot already picks the status, so validate against the
+# concrete model instead of dispatching through the ProgressResponse union.
+_PROGRESS_MODELS: dict[str, type[BaseModel]] = {
+    "idle": IdleProgress,
+    "queued": QueuedProgress,
+    "running": RunningProgress,
+    "completed": CompletedProgress,
+    "cancelled": CancelledProgress,
+    "error": ErrorProgress,
+}
+# Per queue: (job_id, progress version) -> (payload, rendered SSE frame).
+_PROGRESS_FRAMES: weakref.WeakKeyDictionary[
+    Any, dict[tuple[str | None, int], tuple[dict[str, Any], bytes]]
+] = weakref.WeakKeyDictionary()
 
 
 def _coerce_str(value: Any) -> str | None:
     """Convierte a str limpio o None si vacío."""
+    if type(value) is str:  # caso común: evita str() en el hot path de SSE
+        return value.strip() or None
     if value is None:
         return None
     text = str(value).strip()
@@ -65,6 +87,8 @@ def _coerce_str(value: Any) -> str | None:
 
 def _coerce_int(value: Any) -> int | None:
     """Convierte a int o None si inválido."""
+    if type(value) is int:  # excluye bool, que sigue pasando por int()
+        return value
     try:
         return None if value is None else int(value)
     except (TypeError, ValueError):
@@ -85,6 +109,13 @@ def _coerce_non_negative_int(value: Any) -> int | None:
     return parsed
 
 
+def _coerce_chapter_pair(current: Any, total: Any) -> tuple[int | None, int | None]:
+    """Normaliza (current_chapter, total_chapters) a enteros positivos o None."""
+    if type(current) is int and type(total) is int:  # caso común en un job en curso
+        return (current if current > 0 else None, total if total > 0 else None)
+    return _coerce_positive_int(current), _coerce_positive_int(total)
+
+
 def _public_error_details(value: Any) -> dict[str, Any] | None:
     if not isinstance(value, dict):
         return None
@@ -92,67 +123,82 @@ def _public_error_details(value: Any) -> dict[str, Any] | None:
     return public or None
 
 
+def _build_queued_snapshot(get: Callable[[str], Any], base: dict[str, Any]) -> dict[str, Any]:
+    queue_position = _coerce_int(get("queue_position"))
+    return {**base, "status": "queued", "queue_position": max(1, queue_position or 1)}
+
+
+def _build_completed_snapshot(get: Callable[[str], Any], base: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **base,
+        "status": "completed",
+        "title": _coerce_str(get("title")),
+        "epub": _coerce_str(get("epub")),
+        "pdf": get("pdf"),
+    }
+
+
+def _build_cancelled_snapshot(get: Callable[[str], Any], base: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **base,
+        "status": "cancelled",
+        "error": _coerce_str(get("error")) or "Download cancelled by user",
+        "code": _coerce_str(get("code")),
+        "details": _public_error_details(get("details")),
+    }
+
+
+def _build_error_snapshot(get: Callable[[str], Any], base: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **base,
+        "status": "error",
+        "error": _coerce_str(get("error")) or "Download failed",
+        "code": _coerce_str(get("code")),
+        "details": _public_error_details(get("details")),
+    }
+
+
+def _build_running_snapshot(get: Callable[[str], Any], base: dict[str, Any]) -> dict[str, Any]:
+    percentage = max(0, min(100, _coerce_int(get("percentage")) or 0))
+    current_chapter, total_chapters = _coerce_chapter_pair(
+        get("current_chapter"), get("total_chapters")
+    )
+    return {
+        **base,
+        "status": "running",
+        "percentage": percentage,
+        "message": _coerce_str(get("message")),
+        "eta_seconds": _coerce_non_negative_int(get("eta_seconds")),
+        "current_chapter": current_chapter,
+        "total_chapters": total_chapters,
+        "chapter_title": _coerce_str(get("chapter_title")),
+        "title": _coerce_str(get("title")),
+    }
+
+
+# Un builder por estado: cada uno extrae solo sus campos. Cualquier estado
+# desconocido se trata como "running", igual que antes.
+_SNAPSHOT_BUILDERS: dict[str, Callable[[Callable[[str], Any], dict[str, Any]], dict[str, Any]]] = {
+    "queued": _build_queued_snapshot,
+    "completed": _build_completed_snapshot,
+    "cancelled": _build_cancelled_snapshot,
+    "error": _build_error_snapshot,
+}
+
+
 def _normalize_progress_snapshot(snapshot: dict[str, Any] | None) -> dict[str, Any]:
     """Convierte un snapshot crudo del queue en un dict compatible con ProgressResponse."""
     if not isinstance(snapshot, dict):
         return {"status": "idle", "job_id": ""}
 
-    job_id = _coerce_str(snapshot.get("job_id"))
+    get = snapshot.get
+    job_id = _coerce_str(get("job_id"))
     if not job_id:
         return {"status": "idle", "job_id": ""}
 
-    raw_status = (_coerce_str(snapshot.get("status")) or "").lower()
-    book_id = _coerce_str(snapshot.get("book_id"))
-    base: dict[str, Any] = {"job_id": job_id, "book_id": book_id}
-
-    if raw_status == "queued":
-        queue_position = _coerce_int(snapshot.get("queue_position"))
-        return {
-            **base,
-            "status": "queued",
-            "queue_position": max(1, queue_position or 1),
-        }
-
-    if raw_status == "completed":
-        return {
-            **base,
-            "status": "completed",
-            "title": _coerce_str(snapshot.get("title")),
-            "epub": _coerce_str(snapshot.get("epub")),
-            "pdf": snapshot.get("pdf"),
-        }
-
-    if raw_status == "cancelled":
-        return {
-            **base,
-            "status": "cancelled",
-            "error": _coerce_str(snapshot.get("error")) or "Download cancelled by user",
-            "code": _coerce_str(snapshot.get("code")),
-            "details": _public_error_details(snapshot.get("details")),
-        }
-
-    if raw_status == "error":
-        fallback = "Download failed"
-        return {
-            **base,
-            "status": "error",
-            "error": _coerce_str(snapshot.get("error")) or fallback,
-            "code": _coerce_str(snapshot.get("code")),
-            "details": _public_error_details(snapshot.get("details")),
-        }
-
-    percentage = max(0, min(100, _coerce_int(snapshot.get("percentage")) or 0))
-    return {
-        **base,
-        "status": "running",
-        "percentage": percentage,
-        "message": _coerce_str(snapshot.get("message")),
-        "eta_seconds": _coerce_non_negative_int(snapshot.get("eta_seconds")),
-        "current_chapter": _coerce_positive_int(snapshot.get("current_chapter")),
-        "total_chapters": _coerce_positive_int(snapshot.get("total_chapters")),
-        "chapter_title": _coerce_str(snapshot.get("chapter_title")),
-        "title": _coerce_str(snapshot.get("title")),
-    }
+    raw_status = (_coerce_str(get("status")) or "").lower()
+    builder = _SNAPSHOT_BUILDERS.get(raw_status, _build_running_snapshot)
+    return builder(get, {"job_id": job_id, "book_id": _coerce_str(get("book_id"))})
 
 
 def _invalid_progress_payload(snapshot: dict[str, Any] | None) -> dict[str, Any]:
@@ -176,7 +222,24 @@ def _invalid_progress_payload(snapshot: dict[str, Any] | None) -> dict[str, Any]
 
 def _progress_payload(snapshot: dict[str, Any] | None) -> dict[str, Any]:
     normalized = _normalize_progress_snapshot(snapshot)
-    return _PROGRESS_ADAPTER.validate_python(normalized).model_dump(exclude_none=True)
+    model = _PROGRESS_MODELS[normalized["status"]]
+    return model.model_validate(normalized).model_dump(exclude_none=True)
+
+
+def _progress_frame(
+    download_queue: DownloadQueueService, job_id: str | None, version: int
+) -> tuple[dict[str, Any], bytes]:
+    """Build the progress SSE frame once per (job, version) for all subscribers."""
+    frames = _PROGRESS_FRAMES.setdefault(download_queue, {})
+    key = (job_id, version)
+    cached = frames.get(key)
+    if cached is None:
+        payload = _progress_payload(download_queue.get_progress(job_id=job_id))
+        cached = frames[key] = (payload, sse_event("progress", payload))
+        # Waiters always catch up to the latest version, so older frames are dead.
+        for stale in [k for k in frames if k[1] < version - 1]:
+            del frames[stale]
+    return cached
 
 
 # Background task functions
@@ -277,18 +340,19 @@ async def progress_stream(
     """
     logger.info("[%s] Starting SSE stream for job_id=%s", request_id, job_id)
 
-    async def event_stream() -> AsyncIterator[str]:
-        last_signature: str | None = None
-        last_heartbeat_at = time.monotonic()
+    async def event_stream() -> AsyncIterator[bytes]:
+        last_payload: dict[str, Any] | None = None
+        started_at = time.monotonic()
+        last_heartbeat_at = started_at
         progress_version = download_queue.get_progress_version()
-        deadline = time.monotonic() + SSE_MAX_DURATION_SECONDS
+        changed = True  # emit the current snapshot first
+        deadline = started_at + SSE_MAX_DURATION_SECONDS
         disconnect_check_interval = 0.5  # Check disconnect every 500ms
-        last_disconnect_check = time.monotonic()
+        last_disconnect_check = started_at
 
         try:
-            while time.monotonic() < deadline:
+            while (now := time.monotonic()) < deadline:
                 # Check for client disconnection periodically
-                now = time.monotonic()
                 if now - last_disconnect_check >= disconnect_check_interval:
                     last_disconnect_check = now
                     if await request.is_disconnected():
@@ -299,13 +363,14 @@ async def progress_stream(
                         )
                         break
 
-                snapshot = download_queue.get_progress(job_id=job_id)
-                payload = _progress_payload(snapshot)
-                signature = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-
-                if signature != last_signature:
-                    last_signature = signature
-                    yield sse_event("progress", payload)
+                # Heartbeat timeouts leave the version unchanged: nothing to rebuild.
+                if changed:
+                    payload, frame = _progress_frame(download_queue, job_id, progress_version)
+                    # The version is shared by all jobs, so a bump may not touch
+                    # this stream's job; only emit when its payload differs.
+                    if payload != last_payload:
+                        last_payload = payload
+                        yield frame
 
                 # Check for disconnection again before sleeping
                 if await request.is_disconnected():
@@ -329,6 +394,7 @@ async def progress_stream(
                     progress_version,
                     wait,
                 )
+                changed = next_version != progress_version
                 progress_version = next_version
 
                 now = time.monotonic()
@@ -336,7 +402,7 @@ async def progress_stream(
                     break
                 if now - last_heartbeat_at >= SSE_HEARTBEAT_INTERVAL_SECONDS:
                     last_heartbeat_at = now
-                    yield sse_comment("heartbeat")
+                    yield _HEARTBEAT_FRAME
         except asyncio.CancelledError:
             logger.debug("[%s] SSE stream cancelled for job_id=%s", request_id, job_id)
             return
@@ -402,13 +468,8 @@ def download(
     else:
         output_dir = output_plugin.get_default_dir()
 
-    try:
-        formats = DownloaderPlugin.parse_formats(data.format)
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail={"error": str(exc), "code": ErrorCode.INVALID_FORMAT},
-        )
+    # DownloadRequest's validators already canonicalized and deduplicated these.
+    formats = data.format
 
     selected_chapters = data.chapters
     if selected_chapters is not None:
@@ -7,10 +7,11 @@ import logging
 import shutil
 import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 
 import config
@@ -401,14 +402,33 @@ def _check_sqlite_connections(request: Request) -> SQLiteConnectionsInfo:
     )
 
 
+@lru_cache(maxsize=1)
+def _settings_body(output_dir: str) -> bytes:
+    return SettingsResponse(output_dir=output_dir).model_dump_json().encode()
+
+
+@lru_cache(maxsize=1)
+def _formats_body() -> bytes:
+    return FormatsResponse(**DownloaderPlugin.get_formats_info()).model_dump_json().encode()
+
+
 @router.get("/settings", response_model=SettingsResponse)
-def get_settings() -> SettingsResponse:
-    return SettingsResponse(output_dir=str(config.OUTPUT_DIR))
+async def get_settings() -> Response:
+    # Keyed on the current value, so set_output_dir needs no invalidation hook.
+    return Response(_settings_body(str(config.OUTPUT_DIR)), media_type="application/json")
 
 
 @router.get("/formats", response_model=FormatsResponse)
-def get_formats() -> FormatsResponse:
-    return FormatsResponse(**DownloaderPlugin.get_formats_info())
+async def get_formats() -> Response:
+    # The format table is fixed per process; serialize it once.
+    return Response(_formats_body(), media_type="application/json")
+
+
+def _resolve_reveal_path(raw_path: str) -> tuple[Path, Path, bool]:
+    """Resolve the target and output dir and stat the target in one thread hop."""
+    path = Path(raw_path).resolve()
+    allowed_base = Path(config.OUTPUT_DIR).resolve()
+    return path, allowed_base, path.exists()
 
 
 @router.post(
@@ -427,8 +447,7 @@ async def reveal_file(
             detail={"error": "Path is required", "code": ErrorCode.PATH_REQUIRED},
         )
 
-    path = Path(data.path).resolve()
-    allowed_base = Path(config.OUTPUT_DIR).resolve()
+    path, allowed_base, exists = await asyncio.to_thread(_resolve_reveal_path, data.path)
     try:
         path.relative_to(allowed_base)
     except ValueError:
@@ -439,7 +458,7 @@ async def reveal_file(
                 "code": ErrorCode.PATH_OUTSIDE_OUTPUT_DIR,
             },
         )
-    if not path.exists():
+    if not exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error": "Path does not exist", "code": ErrorCode.PATH_NOT_FOUND},
@@ -486,7 +505,7 @@ async def set_output_dir(
         selected = await asyncio.to_thread(system_plugin.show_folder_picker, config.OUTPUT_DIR)
         if selected:
             # Validar igual que path manual
-            success, message, path = output_plugin.validate_dir(selected)
+            success, message, path = await asyncio.to_thread(output_plugin.validate_dir, selected)
             if not success:
                 return error_response(
                     message or "Invalid output directory",
@@ -512,7 +531,7 @@ async def set_output_dir(
             code=ErrorCode.PATH_REQUIRED,
         )
 
-    success, message, path = output_plugin.validate_dir(data.path)
+    success, message, path = await asyncio.to_thread(output_plugin.validate_dir, data.path)
     if not success:
         return error_response(
             message or "Invalid output directory",
@@ -285,7 +285,7 @@ class DownloadRequest(_RequestModel):
                 raise ValueError("format must not be empty")
             return [stripped]
         if isinstance(value, (list, tuple, set)):
-            clean = [str(item).strip() for item in value if str(item).strip()]
+            clean = [text for item in value if (text := str(item).strip())]
             if not clean:
                 raise ValueError("format list must contain at least one value")
             return clean
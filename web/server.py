@@ -12,6 +12,7 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import hmac
+import importlib.util
 import ipaddress
 import logging
 import threading
@@ -20,6 +21,7 @@ import uuid
 from collections import defaultdict
 from collections.abc import Awaitable, Callable, Mapping, Sequence
 from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -28,7 +30,7 @@ from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import Response
 
@@ -57,7 +59,16 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 _FRONTEND_STATIC_DIRS: tuple[str, ...] = ("_astro", "icons", "locales")
+# Astro content-hashes every file it writes under ``_astro``.
+_HASHED_FRONTEND_DIRS: frozenset[str] = frozenset({"_astro"})
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Only used for StaticFiles.file_response, which answers If-None-Match and
+# If-Modified-Since with 304 instead of resending the file.
+_SPA_FILES = StaticFiles(directory=None, check_dir=False)
 _RESERVED_FRONTEND_PREFIXES: tuple[str, ...] = ("api", "metrics")
+# Fixed SPA fallback bodies, rendered once instead of per request.
+_FRONTEND_NOT_FOUND_BODY: bytes = bytes(JSONResponse({"detail": "Not Found"}).body)
+_FRONTEND_RUNNING_BODY: bytes = bytes(JSONResponse({"name": "Ryliox", "status": "running"}).body)
 
 _RATE_LIMITED_ENDPOINTS: frozenset[tuple[str, str]] = frozenset(
     {
@@ -166,15 +177,40 @@ NextHandler = Callable[[Request], Awaitable[Response]]
 MiddlewareHandler = Callable[[Request, NextHandler], Awaitable[Response]]
 
 
-def _request_id_middleware_factory() -> MiddlewareHandler:
-    async def _middleware(request: Request, call_next: NextHandler) -> Response:
-        request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+class RequestIdMiddleware:
+    """Propagate ``X-Request-ID`` by reading and writing raw ASGI headers.
 
-    return _middleware
+    Outermost middleware, so it runs on every request; working on the scope and
+    the start message avoids a ``BaseHTTPMiddleware`` task and response wrapper.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        raw_request_id = next(
+            (value for name, value in scope["headers"] if name == b"x-request-id"), b""
+        )
+        if not raw_request_id:
+            raw_request_id = uuid.uuid4().hex.encode("ascii")
+        scope.setdefault("state", {})["request_id"] = raw_request_id.decode("latin-1")
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    item
+                    for item in message.get("headers", ())
+                    if item[0].lower() != b"x-request-id"
+                ]
+                headers.append((b"x-request-id", raw_request_id))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
 
 
 def _rate_limit_middleware_factory(limiter: _RateLimiter) -> MiddlewareHandler:
@@ -232,30 +268,60 @@ def _admin_auth_middleware_factory() -> MiddlewareHandler:
 # ─── Security headers middleware ────────────────────────────────────────────
 
 
-def _security_headers_middleware_factory() -> MiddlewareHandler:
-    async def _middleware(request: Request, call_next: NextHandler) -> Response:
-        if not config.SETTINGS.security.enable_security_headers:
-            return await call_next(request)
-        response = await call_next(request)
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
-        response.headers.setdefault("X-Frame-Options", "DENY")
-        response.headers.setdefault("X-XSS-Protection", "1; mode=block")
-        response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
-        response.headers.setdefault("Permissions-Policy", "geolocation=(), microphone=()")
-        response.headers.setdefault("Cross-Origin-Opener-Policy", "same-origin")
-        response.headers.setdefault("Cross-Origin-Resource-Policy", "same-origin")
-        if config.SETTINGS.security.csp_policy:
-            response.headers.setdefault(
-                "Content-Security-Policy", config.SETTINGS.security.csp_policy
-            )
-        if config.SETTINGS.security.enable_hsts:
-            response.headers.setdefault(
+def _security_headers() -> list[tuple[str, str]]:
+    """Return the security headers enabled by the current settings."""
+    security = config.SETTINGS.security
+    if not security.enable_security_headers:
+        return []
+    headers = [
+        ("X-Content-Type-Options", "nosniff"),
+        ("X-Frame-Options", "DENY"),
+        ("X-XSS-Protection", "1; mode=block"),
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
+        ("Permissions-Policy", "geolocation=(), microphone=()"),
+        ("Cross-Origin-Opener-Policy", "same-origin"),
+        ("Cross-Origin-Resource-Policy", "same-origin"),
+    ]
+    if security.csp_policy:
+        headers.append(("Content-Security-Policy", security.csp_policy))
+    if security.enable_hsts:
+        headers.append(
+            (
                 "Strict-Transport-Security",
-                f"max-age={config.SETTINGS.security.hsts_max_age}; includeSubDomains",
+                f"max-age={security.hsts_max_age}; includeSubDomains",
             )
-        return response
+        )
+    return headers
 
-    return _middleware
+
+class SecurityHeadersMiddleware:
+    """Add security headers on ``http.response.start`` without wrapping the response.
+
+    The header list is built once per app, and streaming responses (SSE) pass
+    straight through instead of being re-streamed by ``BaseHTTPMiddleware``.
+    """
+
+    def __init__(self, app: ASGIApp, headers: Sequence[tuple[str, str]]) -> None:
+        self.app = app
+        # Encoded once, in the lowercase form ASGI servers expect.
+        self.raw_headers: tuple[tuple[bytes, bytes], ...] = tuple(
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.raw_headers:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(item for item in self.raw_headers if item[0] not in present)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 # ─── Error sanitisation ─────────────────────────────────────────────────────
@@ -406,10 +472,11 @@ def create_app() -> FastAPI:
             allow_origins=settings.security.cors_origins,
             allow_credentials=True,
             allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            allow_headers=["*"],
+            allow_headers=settings.security.cors_allow_headers,
+            max_age=settings.security.cors_max_age,
         )
 
-    app.middleware("http")(_security_headers_middleware_factory())
+    app.add_middleware(SecurityHeadersMiddleware, headers=_security_headers())
     app.add_middleware(
         RequestBodyLimitMiddleware,
         max_bytes=settings.security.max_request_size_mb * 1024 * 1024,
@@ -419,7 +486,7 @@ def create_app() -> FastAPI:
     )
     app.middleware("http")(_admin_auth_middleware_factory())
     app.middleware("http")(_rate_limit_middleware_factory(app.state.rate_limiter))
-    app.middleware("http")(_request_id_middleware_factory())
+    app.add_middleware(RequestIdMiddleware)
 
     @app.post("/api/admin/session", include_in_schema=False)
     async def _create_admin_session(request: Request) -> Response:
@@ -473,14 +540,12 @@ def create_app() -> FastAPI:
         )
 
     @app.exception_handler(ForbiddenOriginError)
-    async def _forbidden_origin_handler(
-        request: Request, exc: ForbiddenOriginError
-    ) -> JSONResponse:
+    async def _forbidden_origin_handler(request: Request, exc: ForbiddenOriginError) -> Response:
         logger.warning("Cross-origin request blocked: %s", exc)
-        return error_response(
-            f"Cross-origin request blocked for '{exc.args[0]}'.",
-            status.HTTP_403_FORBIDDEN,
-            code=ErrorCode.CROSS_ORIGIN_BLOCKED,
+        return Response(
+            _forbidden_origin_body(exc.args[0]),
+            status_code=status.HTTP_403_FORBIDDEN,
+            media_type="application/json",
         )
 
     @app.exception_handler(Exception)
@@ -495,6 +560,27 @@ def create_app() -> FastAPI:
     return app
 
 
+class _ImmutableStaticFiles(StaticFiles):
+    """Static files whose names change with their content, cacheable forever."""
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = _IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+@lru_cache(maxsize=32)
+def _forbidden_origin_body(action: str) -> bytes:
+    """Render the 403 body once per guarded action (a small, fixed set)."""
+    return bytes(
+        error_response(
+            f"Cross-origin request blocked for '{action}'.",
+            status.HTTP_403_FORBIDDEN,
+            code=ErrorCode.CROSS_ORIGIN_BLOCKED,
+        ).body
+    )
+
+
 def _mount_static(app: FastAPI) -> None:
     """Mount static asset directories, preferring the modern Astro build."""
     frontend_dist: Path = config.REPO_ROOT / "frontend" / "dist"
@@ -505,9 +591,14 @@ def _mount_static(app: FastAPI) -> None:
         for directory_name in _FRONTEND_STATIC_DIRS:
             directory = frontend_dist / directory_name
             if directory.is_dir():
+                static_files_cls = (
+                    _ImmutableStaticFiles
+                    if directory_name in _HASHED_FRONTEND_DIRS
+                    else StaticFiles
+                )
                 app.mount(
                     f"/{directory_name}",
-                    StaticFiles(directory=directory, check_dir=False),
+                    static_files_cls(directory=directory, check_dir=False),
                     name=f"frontend-{directory_name}",
                 )
         mounted.append(frontend_dist)
@@ -518,25 +609,46 @@ def _mount_static(app: FastAPI) -> None:
     if not mounted:
         return
 
-    @app.get("/{path:path}", include_in_schema=False)
-    async def _frontend_entry(path: str) -> object:
+    # The dist tree only changes on rebuild, so resolve it once here rather
+    # than stat-ing and realpath-ing every probed URL.
+    frontend_files = _collect_static_files(frontend_dist) if frontend_dist.is_dir() else {}
+    legacy_index = legacy_static / "index.html"
+    legacy_fallback = legacy_index if legacy_index.is_file() else None
+    fallback_index = frontend_files.get("index.html") or legacy_fallback
+
+    async def _frontend_entry(request: Request) -> Response:
+        path: str = request.path_params["path"]
         if _is_reserved_frontend_path(path):
-            return JSONResponse({"detail": "Not Found"}, status_code=status.HTTP_404_NOT_FOUND)
+            return Response(
+                _FRONTEND_NOT_FOUND_BODY,
+                status_code=status.HTTP_404_NOT_FOUND,
+                media_type="application/json",
+            )
+
+        for candidate in (frontend_files.get(path), fallback_index, legacy_fallback):
+            if candidate is not None:
+                response = _spa_file_response(request, candidate)
+                if response is not None:
+                    return response
 
-        if frontend_dist.is_dir():
-            candidate = _safe_static_file(frontend_dist, path)
-            if candidate and candidate.is_file():
-                return FileResponse(candidate)
+        return Response(_FRONTEND_RUNNING_BODY, media_type="application/json")
 
-            index = frontend_dist / "index.html"
-            if index.is_file():
-                return FileResponse(index)
+    # Plain Starlette route: the SPA fallback needs no dependency injection or
+    # response-model handling, so it skips FastAPI's per-request solver.
+    app.router.add_route("/{path:path}", _frontend_entry, methods=["GET"], include_in_schema=False)
 
-        legacy_index = legacy_static / "index.html"
-        if legacy_index.is_file():
-            return FileResponse(legacy_index)
 
-        return JSONResponse({"name": "Ryliox", "status": "running"})
+def _spa_file_response(request: Request, path: Path) -> Response | None:
+    """Serve ``path`` with conditional-request support, or None if it is gone.
+
+    The file map is built at startup, so a frontend rebuild can remove files
+    it still lists.
+    """
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        return None
+    return _SPA_FILES.file_response(path, stat_result, request.scope)
 
 
 def _is_reserved_frontend_path(path: str) -> bool:
@@ -544,17 +656,18 @@ def _is_reserved_frontend_path(path: str) -> bool:
     return first_segment in _RESERVED_FRONTEND_PREFIXES
 
 
-def _safe_static_file(root: Path, path: str) -> Path | None:
-    if not path:
-        return None
+def _collect_static_files(root: Path) -> dict[str, Path]:
+    """Map each file's URL path under ``root`` to its resolved location.
 
+    Symlinks that point outside ``root`` are left out, as before.
+    """
     root = root.resolve()
-    candidate = (root / path).resolve()
-    try:
-        candidate.relative_to(root)
-    except ValueError:
-        return None
-    return candidate
+    files: dict[str, Path] = {}
+    for path in root.rglob("*"):
+        resolved = path.resolve()
+        if resolved.is_file() and resolved.is_relative_to(root):
+            files[path.relative_to(root).as_posix()] = resolved
+    return files
 
 
 # ─── Entrypoint ──────────────────────────────────────────────────────────────
@@ -563,16 +676,33 @@ def _safe_static_file(root: Path, path: str) -> Path | None:
 app = create_app()
 
 
+def _server_loop_and_http() -> tuple[str, str]:
+    """Pick uvloop/httptools when installed, else the pure-Python fallbacks.
+
+    ``uvicorn[standard]`` ships both except on Windows, where uvloop does not
+    exist and the stdlib asyncio loop is used instead.
+    """
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
 def run_server(host: str | None = None, port: int | None = None) -> None:
     """Run the Uvicorn server (used by ``main.py`` and the launcher)."""
     configure_logging(
         level=config.SETTINGS.logging.level,
         json_format=config.SETTINGS.logging.json_logs,
     )
+    loop, http = _server_loop_and_http()
     uvicorn.run(
         "web.server:app",
         host=host or config.SETTINGS.server.host,
         port=port or config.SETTINGS.server.port,
+        loop=loop,
+        http=http,
+        lifespan="on",
+        timeout_keep_alive=config.SETTINGS.server.timeout_keep_alive,
+        backlog=config.SETTINGS.server.backlog,
         reload=False,
         log_level=config.SETTINGS.logging.level.lower(),
         access_log=False,